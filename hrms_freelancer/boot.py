@@ -9,15 +9,19 @@ import frappe
 from frappe import _
 
 
+# Static payload shared by every boot; do not mutate
+_BOOT_PAYLOAD = {
+    "version": "1.0.0",
+    "features": {
+        "vat_management": True,
+        "tax_treaties": True,
+        "multi_currency": True,
+        "gdpr_compliance": True
+    }
+}
+
+
 def boot_session(bootinfo):
     """Add data to the boot session"""
     if frappe.session.user != "Guest":
-        bootinfo.hrms_freelancer = {
-            "version": "1.0.0",
-            "features": {
-                "vat_management": True,
-                "tax_treaties": True,
-                "multi_currency": True,
-                "gdpr_compliance": True
-            }
-        }
+        bootinfo.hrms_freelancer = _BOOT_PAYLOAD
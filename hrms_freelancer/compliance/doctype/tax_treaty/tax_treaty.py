@@ -3,17 +3,73 @@ Tax Treaty DocType Controller
 Manages international tax treaty configurations for freelancer payments
 """
 
-from typing import TYPE_CHECKING, Optional, Dict, Any, List
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, FrozenSet, Tuple
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.utils import getdate, nowdate
 
+from hrms_freelancer.utils.constants import EU_COUNTRY_NAME_SET
+
 if TYPE_CHECKING:
     from frappe.types import DF
 
 
+# Withholding result for payments between two EU member states
+_EU_ZERO_RESULT = MappingProxyType({
+    "rate": 0,
+    "treaty_applied": False,
+    "eu_member": True,
+    "notes": "No withholding tax within EU member states"
+})
+
+# Percentage fields checked by TaxTreaty.validate_rates
+_RATE_FIELDS = (
+    "standard_rate", "reduced_rate", "dividend_rate", "interest_rate",
+    "royalty_rate", "service_fee_rate", "independent_services_rate"
+)
+
+# Default withholding rates by country (without treaty)
+_DEFAULT_WITHHOLDING_RATES: Dict[str, float] = {
+    "United States": 30,
+    "United Kingdom": 20,
+    "India": 10,
+    "China": 10,
+    "Brazil": 15,
+    "Australia": 30,
+    "Canada": 25,
+    "Japan": 20,
+    "South Korea": 20,
+    "Russia": 20,
+}
+
+# Treaty rate fields to try, in order, for each income type
+_RATE_FIELDS_BY_INCOME_TYPE: Dict[str, tuple] = {
+    "services": ("independent_services_rate", "service_fee_rate", "reduced_rate"),
+    "dividends": ("dividend_rate", "reduced_rate"),
+    "interest": ("interest_rate", "reduced_rate"),
+    "royalties": ("royalty_rate", "reduced_rate"),
+}
+
+# Columns returned by get_applicable_treaty
+_TREATY_LOOKUP_FIELDS = [
+    "name", "treaty_name", "treaty_code", "effective_date",
+    "reduced_rate", "service_fee_rate", "independent_services_rate",
+    "certificate_required", "form_required",
+    "minimum_stay_days", "permanent_establishment_threshold"
+]
+
+# Redis key whose value changes whenever treaties are modified
+TREATY_INDEX_VERSION_KEY = "tax_treaty_index_version"
+
+# Per-site (version, index) of active treaties, see _get_treaty_index
+_treaty_index_by_site: Dict[str, Tuple[Any, Dict[Tuple[str, str], List[Dict[str, Any]]]]] = {}
+
+
 class TaxTreaty(Document):
     """
     Tax Treaty DocType for managing double taxation agreements
@@ -33,6 +89,9 @@ class TaxTreaty(Document):
         service_fee_rate: DF.Percent | None
         independent_services_rate: DF.Percent | None
 
+    # Field labels for the rate fields, filled from meta on first use
+    _RATE_LABELS: Optional[Dict[str, str]] = None
+
     def validate(self) -> None:
         """Validate tax treaty data"""
         self.validate_countries()
@@ -40,6 +99,14 @@ class TaxTreaty(Document):
         self.validate_rates()
         self.set_treaty_code()
     
+    def on_update(self) -> None:
+        """Invalidate cached treaty lookups"""
+        clear_treaty_cache()
+    
+    def on_trash(self) -> None:
+        """Invalidate cached treaty lookups"""
+        clear_treaty_cache()
+    
     def validate_countries(self) -> None:
         """Ensure different countries are selected"""
         if self.country_1 == self.country_2:
@@ -61,15 +128,13 @@ class TaxTreaty(Document):
     
     def validate_rates(self) -> None:
         """Validate tax rates are reasonable"""
-        for field in ["standard_rate", "reduced_rate", "dividend_rate", 
-                      "interest_rate", "royalty_rate", "service_fee_rate",
-                      "independent_services_rate"]:
-            rate = getattr(self, field, None)
+        for field in _RATE_FIELDS:
+            rate = self.get(field)
             if rate is not None:
                 if rate < 0 or rate > 100:
                     frappe.throw(
                         _("{0} must be between 0 and 100").format(
-                            self.meta.get_field(field).label
+                            self.get_rate_label(field)
                         )
                     )
         
@@ -82,12 +147,26 @@ class TaxTreaty(Document):
                     indicator="orange"
                 )
     
+    def get_rate_label(self, field: str) -> str:
+        """Get the label of a rate field"""
+        if TaxTreaty._RATE_LABELS is None:
+            TaxTreaty._RATE_LABELS = {
+                f: self.meta.get_field(f).label for f in _RATE_FIELDS
+            }
+        return TaxTreaty._RATE_LABELS[field]
+    
     def set_treaty_code(self) -> None:
         """Auto-generate treaty code if not set"""
         if not self.treaty_code:
-            # Get country codes
-            c1_code = frappe.db.get_value("Country", self.country_1, "code") or self.country_1[:2]
-            c2_code = frappe.db.get_value("Country", self.country_2, "code") or self.country_2[:2]
+            # Get country codes for both countries in one query
+            rows = frappe.get_all(
+                "Country",
+                filters={"name": ("in", (self.country_1, self.country_2))},
+                fields=["name", "code"]
+            )
+            codes_by_name = {r.name: r.code for r in rows}
+            c1_code = codes_by_name.get(self.country_1) or self.country_1[:2]
+            c2_code = codes_by_name.get(self.country_2) or self.country_2[:2]
             
             # Sort alphabetically
             codes = sorted([c1_code.upper(), c2_code.upper()])
@@ -109,30 +188,45 @@ def get_applicable_treaty(
     Returns:
         Treaty details if found, None otherwise
     """
-    # Look for active treaty between the two countries
-    treaty = frappe.db.sql("""
-        SELECT 
-            name, treaty_name, treaty_code,
-            reduced_rate, service_fee_rate, independent_services_rate,
-            certificate_required, form_required,
-            minimum_stay_days, permanent_establishment_threshold
-        FROM `tabTax Treaty`
-        WHERE status = 'Active'
-        AND (
-            (country_1 = %s AND country_2 = %s)
-            OR (country_1 = %s AND country_2 = %s)
-        )
-        AND (expiry_date IS NULL OR expiry_date >= %s)
-        ORDER BY effective_date DESC
-        LIMIT 1
-    """, (source_country, target_country, target_country, source_country, nowdate()), as_dict=True)
+    today = getdate(nowdate())
     
-    if treaty:
-        return treaty[0]
+    # Treaties are ordered by effective_date desc; first unexpired one wins
+    for treaty in _get_treaty_index().get((source_country, target_country), ()):
+        if not treaty.expiry_date or getdate(treaty.expiry_date) >= today:
+            return treaty
     
     return None
 
 
+def _get_treaty_index() -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    """
+    Get the in-memory index of active treaties keyed by country pair
+    
+    The index is built once per worker and site, and rebuilt when
+    clear_treaty_cache bumps the version stored in Redis.
+    """
+    site = frappe.local.site
+    version = frappe.cache().get_value(TREATY_INDEX_VERSION_KEY)
+    cached = _treaty_index_by_site.get(site)
+    
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    index: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for treaty in frappe.get_all(
+        "Tax Treaty",
+        filters={"status": "Active"},
+        fields=["country_1", "country_2", "expiry_date", *_TREATY_LOOKUP_FIELDS],
+        order_by="effective_date desc",
+        limit_page_length=0
+    ):
+        index.setdefault((treaty.country_1, treaty.country_2), []).append(treaty)
+        index.setdefault((treaty.country_2, treaty.country_1), []).append(treaty)
+    
+    _treaty_index_by_site[site] = (version, index)
+    return index
+
+
 @frappe.whitelist()
 def get_withholding_rate(
     freelancer_country: str,
@@ -151,30 +245,17 @@ def get_withholding_rate(
         Dictionary with rate and treaty information
     """
     # Check for EU countries (no withholding within EU)
-    eu_countries = get_eu_countries()
-    
-    if freelancer_country in eu_countries and company_country in eu_countries:
-        return {
-            "rate": 0,
-            "treaty_applied": False,
-            "eu_member": True,
-            "notes": "No withholding tax within EU member states"
-        }
+    if freelancer_country in EU_COUNTRY_NAME_SET and company_country in EU_COUNTRY_NAME_SET:
+        # Copy so the whitelisted response stays JSON serializable
+        return dict(_EU_ZERO_RESULT)
     
     # Look for applicable treaty
     treaty = get_applicable_treaty(freelancer_country, company_country)
     
     if treaty:
         # Determine applicable rate based on income type
-        rate_fields = {
-            "services": ["independent_services_rate", "service_fee_rate", "reduced_rate"],
-            "dividends": ["dividend_rate", "reduced_rate"],
-            "interest": ["interest_rate", "reduced_rate"],
-            "royalties": ["royalty_rate", "reduced_rate"]
-        }
-        
         rate = None
-        for field in rate_fields.get(income_type, ["reduced_rate"]):
+        for field in _RATE_FIELDS_BY_INCOME_TYPE.get(income_type, ("reduced_rate",)):
             rate = treaty.get(field)
             if rate is not None:
                 break
@@ -189,140 +270,55 @@ def get_withholding_rate(
             "notes": f"Rate under {treaty.treaty_name}"
         }
     
-    # Default rates by country (without treaty)
-    default_rates = {
-        "United States": 30,
-        "United Kingdom": 20,
-        "India": 10,
-        "China": 10,
-        "Brazil": 15,
-        "Australia": 30,
-        "Canada": 25,
-        "Japan": 20,
-        "South Korea": 20,
-        "Russia": 20,
-    }
-    
     return {
-        "rate": default_rates.get(freelancer_country, 30),
+        "rate": _DEFAULT_WITHHOLDING_RATES.get(freelancer_country, 30),
         "treaty_applied": False,
         "notes": "No applicable treaty found. Default withholding rate applied."
     }
 
 
-def get_eu_countries() -> List[str]:
-    """Get list of EU member states"""
-    return [
-        "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czech Republic",
-        "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary",
-        "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg", "Malta", "Netherlands",
-        "Poland", "Portugal", "Romania", "Slovakia", "Slovenia", "Spain", "Sweden"
-    ]
+def clear_treaty_cache() -> None:
+    """Invalidate the treaty index in all workers once the transaction commits"""
+    frappe.db.after_commit.add(_bump_treaty_index_version)
+
+
+def _bump_treaty_index_version() -> None:
+    """
+    Change the treaty index version stored in Redis
+    
+    Runs after commit, so a worker that rebuilds under the new version
+    reads the committed treaties.
+    """
+    frappe.cache().set_value(TREATY_INDEX_VERSION_KEY, frappe.generate_hash(length=10))
+
+
+def get_eu_countries() -> FrozenSet[str]:
+    """Get set of EU member states"""
+    return EU_COUNTRY_NAME_SET
 
 
 @frappe.whitelist()
 def get_treaty_countries() -> List[Dict[str, str]]:
     """Get all countries with active tax treaties"""
-    countries = frappe.db.sql("""
-        SELECT DISTINCT country_1 as country FROM `tabTax Treaty` WHERE status = 'Active'
-        UNION
-        SELECT DISTINCT country_2 as country FROM `tabTax Treaty` WHERE status = 'Active'
-        ORDER BY country
-    """, as_dict=True)
-    
-    return countries
+    rows = frappe.db.sql("""
+        SELECT country_1, country_2 FROM `tabTax Treaty` WHERE status = 'Active'
+    """)
+
+    # Deduplicate and sort in Python rather than UNION + ORDER BY in SQL
+    countries = sorted({country for pair in rows for country in pair if country})
+
+    return [{"country": country} for country in countries]
 
 
 # Fixtures: Common tax treaties (2026 estimates)
+@lru_cache(maxsize=1)
 def get_default_tax_treaties() -> List[Dict[str, Any]]:
     """
     Get default tax treaty configurations
     These are estimates and should be verified with official sources
+    
+    The list is loaded once from setup/data and shared between callers,
+    so it must not be mutated.
     """
-    return [
-        {
-            "treaty_code": "NL-US",
-            "treaty_name": "Netherlands-United States Income Tax Treaty",
-            "country_1": "Netherlands",
-            "country_2": "United States",
-            "status": "Active",
-            "treaty_type": "Double Taxation Agreement (DTA)",
-            "standard_rate": 30,
-            "reduced_rate": 15,
-            "dividend_rate": 15,
-            "interest_rate": 0,
-            "royalty_rate": 0,
-            "service_fee_rate": 0,
-            "independent_services_rate": 0,
-            "certificate_required": 1,
-            "form_required": "W-8BEN",
-            "minimum_stay_days": 183,
-            "permanent_establishment_threshold": 183,
-            "official_source_url": "https://www.irs.gov/businesses/international-businesses/netherlands-tax-treaty-documents"
-        },
-        {
-            "treaty_code": "NL-UK",
-            "treaty_name": "Netherlands-United Kingdom Double Taxation Convention",
-            "country_1": "Netherlands",
-            "country_2": "United Kingdom",
-            "status": "Active",
-            "treaty_type": "Double Taxation Agreement (DTA)",
-            "standard_rate": 20,
-            "reduced_rate": 0,
-            "dividend_rate": 10,
-            "interest_rate": 0,
-            "royalty_rate": 0,
-            "service_fee_rate": 0,
-            "independent_services_rate": 0,
-            "certificate_required": 1,
-            "minimum_stay_days": 183
-        },
-        {
-            "treaty_code": "DE-US",
-            "treaty_name": "Germany-United States Income Tax Treaty",
-            "country_1": "Germany",
-            "country_2": "United States",
-            "status": "Active",
-            "treaty_type": "Double Taxation Agreement (DTA)",
-            "standard_rate": 30,
-            "reduced_rate": 15,
-            "dividend_rate": 15,
-            "interest_rate": 0,
-            "royalty_rate": 0,
-            "service_fee_rate": 0,
-            "certificate_required": 1,
-            "form_required": "W-8BEN",
-            "minimum_stay_days": 183
-        },
-        {
-            "treaty_code": "NL-IN",
-            "treaty_name": "Netherlands-India Double Taxation Avoidance Agreement",
-            "country_1": "Netherlands",
-            "country_2": "India",
-            "status": "Active",
-            "treaty_type": "Double Taxation Agreement (DTA)",
-            "standard_rate": 40,
-            "reduced_rate": 10,
-            "dividend_rate": 10,
-            "interest_rate": 10,
-            "royalty_rate": 10,
-            "service_fee_rate": 10,
-            "certificate_required": 1,
-            "minimum_stay_days": 183
-        },
-        {
-            "treaty_code": "DE-UK",
-            "treaty_name": "Germany-United Kingdom Double Taxation Convention",
-            "country_1": "Germany",
-            "country_2": "United Kingdom",
-            "status": "Active",
-            "treaty_type": "Double Taxation Agreement (DTA)",
-            "standard_rate": 20,
-            "reduced_rate": 0,
-            "dividend_rate": 10,
-            "interest_rate": 0,
-            "royalty_rate": 0,
-            "certificate_required": 1,
-            "minimum_stay_days": 183
-        }
-    ]
+    with open(frappe.get_app_path("hrms_freelancer", "setup", "data", "default_tax_treaties.json")) as f:
+        return json.load(f)
@@ -3,24 +3,43 @@ VAT Configuration DocType Controller
 Manages VAT rates and rules for different countries
 """
 
+import json
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional, Dict, Any, List
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from hrms_freelancer.utils.constants import EU_COUNTRY_NAME_SET
+from hrms_freelancer.utils.money import to_cents, vat_cents
+
 if TYPE_CHECKING:
     from frappe.types import DF
 
 
-# EU countries as of 2026
-EU_MEMBER_STATES = [
-    "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czech Republic",
-    "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary",
-    "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg", "Malta", "Netherlands",
-    "Poland", "Portugal", "Romania", "Slovakia", "Slovenia", "Spain", "Sweden"
+# Reduced rate fields compared against the standard rate
+_REDUCED_RATE_FIELDS = ("reduced_rate_1", "reduced_rate_2", "super_reduced_rate")
+
+# VAT Configuration columns needed to resolve a rate
+VAT_CONFIG_FIELDS = [
+    "standard_rate", "reduced_rate_1", "b2b_services_rate",
+    "digital_services_rate", "professional_services_rate",
+    "reverse_charge_b2b", "is_eu_member"
 ]
 
+# Rate field per service type; these fall back to the standard rate when unset
+_SERVICE_RATE_FIELDS = {
+    "standard": "standard_rate",
+    "digital": "digital_services_rate",
+    "professional": "professional_services_rate",
+}
+
+# Prefix of the Redis keys holding get_vat_rate results, one key per
+# country/service type/B2B that expires with VAT_RATE_CACHE_TTL
+VAT_RATE_CACHE_KEY = "vat_rate_lookup"
+VAT_RATE_CACHE_TTL = 5 * 60
+
 
 class VATConfiguration(Document):
     """
@@ -36,14 +55,25 @@ class VATConfiguration(Document):
         reverse_charge_b2b: DF.Check
         moss_applicable: DF.Check
 
+    # Field labels for the reduced rate fields, filled from meta on first use
+    _RATE_LABELS: Optional[Dict[str, str]] = None
+
     def validate(self) -> None:
         """Validate VAT configuration"""
         self.set_eu_status()
         self.validate_rates()
     
+    def on_update(self) -> None:
+        """Invalidate cached VAT rate lookups"""
+        clear_vat_rate_cache()
+    
+    def on_trash(self) -> None:
+        """Invalidate cached VAT rate lookups"""
+        clear_vat_rate_cache()
+    
     def set_eu_status(self) -> None:
         """Set EU member status based on country"""
-        self.is_eu_member = self.country in EU_MEMBER_STATES
+        self.is_eu_member = self.country in EU_COUNTRY_NAME_SET
     
     def validate_rates(self) -> None:
         """Validate VAT rates are reasonable"""
@@ -51,15 +81,23 @@ class VATConfiguration(Document):
             frappe.throw(_("Standard VAT rate must be between 0 and 100"))
         
         # Reduced rates should be less than standard
-        for field in ["reduced_rate_1", "reduced_rate_2", "super_reduced_rate"]:
-            rate = getattr(self, field, None)
+        for field in _REDUCED_RATE_FIELDS:
+            rate = self.get(field)
             if rate and rate >= self.standard_rate:
                 frappe.msgprint(
                     _("{0} ({1}%) is not less than standard rate ({2}%). Please verify.").format(
-                        self.meta.get_field(field).label, rate, self.standard_rate
+                        self.get_rate_label(field), rate, self.standard_rate
                     ),
                     indicator="orange"
                 )
+    
+    def get_rate_label(self, field: str) -> str:
+        """Get the label of a reduced rate field"""
+        if VATConfiguration._RATE_LABELS is None:
+            VATConfiguration._RATE_LABELS = {
+                f: self.meta.get_field(f).label for f in _REDUCED_RATE_FIELDS
+            }
+        return VATConfiguration._RATE_LABELS[field]
 
 
 @frappe.whitelist()
@@ -79,15 +117,54 @@ def get_vat_rate(
     Returns:
         VAT rate information
     """
-    config = frappe.db.get_value(
-        "VAT Configuration",
-        country,
-        ["standard_rate", "reduced_rate_1", "b2b_services_rate", 
-         "digital_services_rate", "professional_services_rate",
-         "reverse_charge_b2b", "is_eu_member"],
-        as_dict=True
+    key = f"{country}|{service_type}|{bool(is_b2b)}"
+    
+    # Per-request memo in front of the Redis cache
+    if not hasattr(frappe.local, "vat_rate_cache"):
+        frappe.local.vat_rate_cache = {}
+    
+    if key not in frappe.local.vat_rate_cache:
+        cache_key = f"{VAT_RATE_CACHE_KEY}:{key}"
+        vat_rate = frappe.cache().get_value(cache_key)
+        if vat_rate is None:
+            vat_rate = _get_vat_rate(country, service_type, is_b2b)
+            frappe.cache().set_value(cache_key, vat_rate, expires_in_sec=VAT_RATE_CACHE_TTL)
+        frappe.local.vat_rate_cache[key] = vat_rate
+    
+    return frappe.local.vat_rate_cache[key]
+
+
+def _get_vat_rate(
+    country: str,
+    service_type: str,
+    is_b2b: bool
+) -> Dict[str, Any]:
+    """Fetch the country's VAT Configuration and resolve the rate"""
+    config = frappe.get_cached_value(
+        "VAT Configuration", country, VAT_CONFIG_FIELDS, as_dict=True
     )
     
+    return resolve_vat_rate(config, country, service_type, is_b2b)
+
+
+def resolve_vat_rate(
+    config: Optional[Dict[str, Any]],
+    country: str,
+    service_type: str = "standard",
+    is_b2b: bool = True
+) -> Dict[str, Any]:
+    """
+    Resolve VAT rate information from an already fetched VAT Configuration
+    
+    Args:
+        config: VAT Configuration row with VAT_CONFIG_FIELDS (or None)
+        country: Country name
+        service_type: Type of service (standard, reduced, digital, professional)
+        is_b2b: Is this a B2B transaction?
+        
+    Returns:
+        VAT rate information
+    """
     if not config:
         # Return default for unknown countries
         return {
@@ -106,21 +183,30 @@ def get_vat_rate(
         }
     
     # Get rate based on service type
-    rate_map = {
-        "standard": config.standard_rate,
-        "reduced": config.reduced_rate_1,
-        "digital": config.digital_services_rate or config.standard_rate,
-        "professional": config.professional_services_rate or config.standard_rate
-    }
+    if service_type == "reduced":
+        rate = config.reduced_rate_1
+    else:
+        rate = config.get(_SERVICE_RATE_FIELDS.get(service_type, "standard_rate")) or config.standard_rate
     
     return {
-        "rate": rate_map.get(service_type, config.standard_rate),
+        "rate": rate,
         "reverse_charge": False,
         "is_eu": config.is_eu_member,
         "notes": f"Standard {service_type} rate for {country}"
     }
 
 
+def clear_vat_rate_cache() -> None:
+    """Drop cached VAT rate lookups, in Redis once the transaction commits"""
+    frappe.local.vat_rate_cache = {}
+    frappe.db.after_commit.add(_delete_vat_rate_cache)
+
+
+def _delete_vat_rate_cache() -> None:
+    """Delete every cached VAT rate lookup in Redis"""
+    frappe.cache().delete_keys(f"{VAT_RATE_CACHE_KEY}:")
+
+
 @frappe.whitelist()
 def calculate_vat(
     amount: float,
@@ -156,191 +242,26 @@ def calculate_vat(
         }
     
     vat_rate = vat_info.get("rate", 0)
-    vat_amount = amount * vat_rate / 100
+    amount_cents = to_cents(amount)
+    vat_amount_cents = vat_cents(amount_cents, to_cents(vat_rate or 0))
     
     return {
         "base_amount": amount,
         "vat_rate": vat_rate,
-        "vat_amount": round(vat_amount, 2),
-        "total_amount": round(amount + vat_amount, 2),
+        "vat_amount": vat_amount_cents / 100,
+        "total_amount": (amount_cents + vat_amount_cents) / 100,
         "reverse_charge": vat_info.get("reverse_charge", False),
         "notes": vat_info.get("notes", "")
     }
 
 
+@lru_cache(maxsize=1)
 def get_default_vat_configurations() -> List[Dict[str, Any]]:
     """
     Get default VAT configurations for EU countries (2026 rates)
+    
+    The list is loaded once from setup/data and shared between callers,
+    so it must not be mutated.
     """
-    return [
-        {
-            "country": "Netherlands",
-            "vat_name": "BTW",
-            "is_eu_member": 1,
-            "standard_rate": 21,
-            "reduced_rate_1": 9,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "registration_threshold": 20000,
-            "threshold_currency": "EUR",
-            "filing_frequency": "Quarterly",
-            "tax_authority": "Belastingdienst",
-            "tax_authority_url": "https://www.belastingdienst.nl",
-            "vat_number_format": "NL + 9 digits + B + 2 digits"
-        },
-        {
-            "country": "Germany",
-            "vat_name": "USt/MwSt",
-            "is_eu_member": 1,
-            "standard_rate": 19,
-            "reduced_rate_1": 7,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "registration_threshold": 22000,
-            "threshold_currency": "EUR",
-            "filing_frequency": "Monthly",
-            "tax_authority": "Bundeszentralamt für Steuern",
-            "tax_authority_url": "https://www.bzst.de",
-            "vat_number_format": "DE + 9 digits"
-        },
-        {
-            "country": "France",
-            "vat_name": "TVA",
-            "is_eu_member": 1,
-            "standard_rate": 20,
-            "reduced_rate_1": 10,
-            "reduced_rate_2": 5.5,
-            "super_reduced_rate": 2.1,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "registration_threshold": 34400,
-            "threshold_currency": "EUR",
-            "filing_frequency": "Monthly",
-            "tax_authority": "Direction Générale des Finances Publiques",
-            "tax_authority_url": "https://www.impots.gouv.fr",
-            "vat_number_format": "FR + 2 chars + 9 digits"
-        },
-        {
-            "country": "Belgium",
-            "vat_name": "BTW/TVA",
-            "is_eu_member": 1,
-            "standard_rate": 21,
-            "reduced_rate_1": 12,
-            "reduced_rate_2": 6,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "registration_threshold": 25000,
-            "threshold_currency": "EUR",
-            "filing_frequency": "Monthly",
-            "tax_authority": "SPF Finances",
-            "tax_authority_url": "https://finances.belgium.be"
-        },
-        {
-            "country": "Spain",
-            "vat_name": "IVA",
-            "is_eu_member": 1,
-            "standard_rate": 21,
-            "reduced_rate_1": 10,
-            "super_reduced_rate": 4,
-            "zero_rate_applicable": 0,
-            "reverse_charge_b2b": 1,
-            "filing_frequency": "Quarterly",
-            "tax_authority": "Agencia Tributaria"
-        },
-        {
-            "country": "Italy",
-            "vat_name": "IVA",
-            "is_eu_member": 1,
-            "standard_rate": 22,
-            "reduced_rate_1": 10,
-            "reduced_rate_2": 5,
-            "super_reduced_rate": 4,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "filing_frequency": "Monthly"
-        },
-        {
-            "country": "Poland",
-            "vat_name": "PTU/VAT",
-            "is_eu_member": 1,
-            "standard_rate": 23,
-            "reduced_rate_1": 8,
-            "reduced_rate_2": 5,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "filing_frequency": "Monthly"
-        },
-        {
-            "country": "Ireland",
-            "vat_name": "VAT",
-            "is_eu_member": 1,
-            "standard_rate": 23,
-            "reduced_rate_1": 13.5,
-            "reduced_rate_2": 9,
-            "super_reduced_rate": 4.8,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "registration_threshold": 37500,
-            "threshold_currency": "EUR",
-            "filing_frequency": "Bi-Monthly"
-        },
-        {
-            "country": "Sweden",
-            "vat_name": "Moms",
-            "is_eu_member": 1,
-            "standard_rate": 25,
-            "reduced_rate_1": 12,
-            "reduced_rate_2": 6,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "threshold_currency": "SEK",
-            "filing_frequency": "Monthly"
-        },
-        {
-            "country": "Denmark",
-            "vat_name": "Moms",
-            "is_eu_member": 1,
-            "standard_rate": 25,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 1,
-            "registration_threshold": 50000,
-            "threshold_currency": "DKK",
-            "filing_frequency": "Quarterly"
-        },
-        {
-            "country": "United Kingdom",
-            "vat_name": "VAT",
-            "is_eu_member": 0,
-            "standard_rate": 20,
-            "reduced_rate_1": 5,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 0,
-            "registration_threshold": 85000,
-            "threshold_currency": "GBP",
-            "filing_frequency": "Quarterly",
-            "tax_authority": "HMRC",
-            "tax_authority_url": "https://www.gov.uk/government/organisations/hm-revenue-customs"
-        },
-        {
-            "country": "Switzerland",
-            "vat_name": "MwSt/TVA/IVA",
-            "is_eu_member": 0,
-            "standard_rate": 8.1,
-            "reduced_rate_1": 2.6,
-            "reduced_rate_2": 3.8,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 0,
-            "registration_threshold": 100000,
-            "threshold_currency": "CHF",
-            "filing_frequency": "Quarterly"
-        },
-        {
-            "country": "United States",
-            "vat_name": "Sales Tax",
-            "is_eu_member": 0,
-            "standard_rate": 0,
-            "zero_rate_applicable": 1,
-            "reverse_charge_b2b": 0,
-            "notes": "No federal VAT. State sales taxes vary by state (0-10%+). Services generally not taxed."
-        }
-    ]
+    with open(frappe.get_app_path("hrms_freelancer", "setup", "data", "default_vat_configurations.json")) as f:
+        return json.load(f)
@@ -9,12 +9,48 @@ from datetime import date, datetime, timedelta
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import getdate, nowdate, add_days, add_months, flt, cint, date_diff
+from frappe.utils import getdate, nowdate, now, add_days, add_months, flt, cint, date_diff
 
 if TYPE_CHECKING:
     from frappe.types import DF
 
 
+# Fields carried over from the old contract by renew_contract
+RENEWAL_COPY_FIELDS = (
+    "naming_series", "title", "freelancer", "freelancer_name", "company",
+    "project_name", "project", "department", "contract_manager",
+    "contract_type", "auto_renew", "renewal_period_months", "notice_period_days",
+    "billing_type", "rate", "currency", "estimated_hours", "estimated_days",
+    "total_value", "maximum_value", "payment_terms", "payment_frequency",
+    "invoice_required", "expense_reimbursement", "expense_limit",
+    "expense_approval_required", "withholding_tax_applicable", "withholding_tax_rate",
+    "vat_applicable", "vat_rate", "reverse_charge", "tax_treaty",
+    "scope_of_work", "deliverables", "terms_and_conditions",
+    "confidentiality_clause", "non_compete_clause", "ip_ownership",
+    "contract_document", "nda_document", "sow_document", "insurance_certificate",
+    "notes"
+)
+
+
+# Prefix of the Redis keys holding get_expiring_contracts results,
+# one key per "today:days" that expires with EXPIRING_CONTRACTS_CACHE_TTL
+EXPIRING_CONTRACTS_CACHE_KEY = "expiring_contracts"
+EXPIRING_CONTRACTS_CACHE_TTL = 60 * 60
+
+# Submitted active contracts of a freelancer overlapping a date range,
+# params: (freelancer, exclude name, range end, range start)
+_OVERLAP_SQL = """
+    SELECT name, title, start_date, end_date
+    FROM `tabFreelancer Contract`
+    WHERE freelancer = %s
+    AND name != %s
+    AND docstatus = 1
+    AND status IN ('Active', 'Pending Approval')
+    AND start_date <= %s
+    AND (end_date IS NULL OR end_date >= %s)
+"""
+
+
 class FreelancerContract(Document):
     """
     Freelancer Contract DocType
@@ -45,13 +81,34 @@ class FreelancerContract(Document):
 
     def validate(self) -> None:
         """Validate contract data before save"""
-        self.validate_dates()
+        # Parsed once here and shared by the validators below
+        self._start_d = getdate(self.start_date) if self.start_date else None
+        self._end_d = getdate(self.end_date) if self.end_date else None
+        
+        # Skip checks whose inputs are unchanged since the last save
+        if self.has_any_value_changed("start_date", "end_date", "contract_type"):
+            self.validate_dates()
+        
         self.validate_rates()
         self.calculate_total_value()
         self.validate_milestones()
-        self.check_overlapping_contracts()
+        
+        if self.has_any_value_changed(
+            "freelancer", "start_date", "end_date", "status", "docstatus"
+        ):
+            self.check_overlapping_contracts()
+        
         self.validate_expense_limits()
-        self.set_compliance_notes()
+        
+        if self.has_any_value_changed(
+            "reverse_charge", "withholding_tax_applicable", "withholding_tax_rate",
+            "tax_treaty", "start_date", "end_date"
+        ):
+            self.set_compliance_notes()
+    
+    def has_any_value_changed(self, *fieldnames: str) -> bool:
+        """True for new documents or if any of the fields changed"""
+        return any(self.has_value_changed(fieldname) for fieldname in fieldnames)
     
     def before_submit(self) -> None:
         """Actions before submitting the contract"""
@@ -74,14 +131,22 @@ class FreelancerContract(Document):
         self.cancel_pending_milestones()
         self.notify_cancellation()
     
+    def on_change(self) -> None:
+        """Invalidate cached expiring contract lists"""
+        clear_expiring_contracts_cache()
+    
+    def on_trash(self) -> None:
+        """Invalidate cached expiring contract lists"""
+        clear_expiring_contracts_cache()
+    
     def validate_dates(self) -> None:
         """Validate contract date logic"""
-        if self.start_date and self.end_date:
-            if getdate(self.end_date) < getdate(self.start_date):
+        if self._start_d and self._end_d:
+            if self._end_d < self._start_d:
                 frappe.throw(_("End date cannot be before start date"))
             
             # Check contract duration
-            duration_days = date_diff(self.end_date, self.start_date)
+            duration_days = (self._end_d - self._start_d).days
             if duration_days > 1095:  # 3 years
                 frappe.msgprint(
                     _("Contract duration exceeds 3 years ({0} days). "
@@ -125,25 +190,26 @@ class FreelancerContract(Document):
             self.total_value = flt(self.rate) * flt(self.estimated_hours)
         elif self.billing_type == "Daily" and self.estimated_days:
             self.total_value = flt(self.rate) * flt(self.estimated_days)
-        elif self.billing_type == "Monthly" and self.start_date and self.end_date:
-            months = date_diff(self.end_date, self.start_date) / 30
-            self.total_value = flt(self.rate) * flt(months)
+        elif self.billing_type == "Monthly" and self._start_d and self._end_d:
+            self.total_value = flt(self.rate) * get_billable_months(self._start_d, self._end_d)
         elif self.billing_type == "Project-Based":
             self.total_value = flt(self.rate)  # Rate is total project value
         elif self.billing_type == "Milestone-Based":
             # Calculate from milestones
-            if hasattr(self, 'milestones') and self.milestones:
-                self.total_value = sum(flt(m.amount) for m in self.milestones)
+            milestones = self.get("milestones")
+            if milestones:
+                self.total_value = sum(flt(m.amount) for m in milestones)
         else:
             # Keep existing value or set to rate
             self.total_value = self.total_value or self.rate
     
     def validate_milestones(self) -> None:
         """Validate milestone amounts and dates"""
-        if not hasattr(self, 'milestones') or not self.milestones:
+        milestones = self.get("milestones")
+        if not milestones:
             return
         
-        total_milestone_value = sum(flt(m.amount) for m in self.milestones)
+        total_milestone_value = sum(flt(m.amount) for m in milestones)
         
         # Check if milestones match contract value
         if self.billing_type == "Milestone-Based":
@@ -156,15 +222,16 @@ class FreelancerContract(Document):
                 )
         
         # Validate milestone dates
-        for milestone in self.milestones:
+        for milestone in milestones:
             if milestone.due_date:
-                if self.start_date and getdate(milestone.due_date) < getdate(self.start_date):
+                due_date = getdate(milestone.due_date)
+                if self._start_d and due_date < self._start_d:
                     frappe.throw(
                         _("Milestone '{0}' due date cannot be before contract start date").format(
                             milestone.title
                         )
                     )
-                if self.end_date and getdate(milestone.due_date) > getdate(self.end_date):
+                if self._end_d and due_date > self._end_d:
                     frappe.throw(
                         _("Milestone '{0}' due date cannot be after contract end date").format(
                             milestone.title
@@ -176,23 +243,9 @@ class FreelancerContract(Document):
         if self.status in ["Draft", "Cancelled", "Terminated", "Expired"]:
             return
         
-        overlapping = frappe.db.sql("""
-            SELECT name, title, start_date, end_date
-            FROM `tabFreelancer Contract`
-            WHERE freelancer = %s
-            AND name != %s
-            AND docstatus = 1
-            AND status IN ('Active', 'Pending Approval')
-            AND (
-                (start_date <= %s AND (end_date IS NULL OR end_date >= %s))
-                OR (start_date <= %s AND (end_date IS NULL OR end_date >= %s))
-                OR (start_date >= %s AND (end_date IS NULL OR end_date <= %s))
-            )
-        """, (
+        overlapping = frappe.db.sql(_OVERLAP_SQL, (
             self.freelancer, self.name or "",
-            self.start_date, self.start_date,
-            self.end_date or "9999-12-31", self.end_date or "9999-12-31",
-            self.start_date, self.end_date or "9999-12-31"
+            self.end_date or "9999-12-31", self.start_date
         ), as_dict=True)
         
         if overlapping:
@@ -230,12 +283,12 @@ class FreelancerContract(Document):
             notes.append(f"Withholding Tax: {self.withholding_tax_rate}% will be deducted from payments")
         
         if self.tax_treaty:
-            treaty_name = frappe.db.get_value("Tax Treaty", self.tax_treaty, "treaty_name")
+            treaty_name = frappe.get_cached_value("Tax Treaty", self.tax_treaty, "treaty_name")
             notes.append(f"Tax Treaty: {treaty_name}")
         
         # Contract duration warning for EU
-        if self.start_date and self.end_date:
-            duration_days = date_diff(self.end_date, self.start_date)
+        if self._start_d and self._end_d:
+            duration_days = (self._end_d - self._start_d).days
             if duration_days > 183:  # 6 months
                 notes.append("Duration >6 months: May trigger permanent establishment considerations")
         
@@ -259,13 +312,34 @@ class FreelancerContract(Document):
                 _("Please attach required documents: {0}").format(", ".join(missing))
             )
     
+    def get_today(self) -> date:
+        """Get today's date, computed once per document"""
+        if getattr(self, "_today", None) is None:
+            self._today = getdate(nowdate())
+        return self._today
+    
+    def get_freelancer_details(self) -> Dict[str, Any]:
+        """Get email, name and status of the linked freelancer, fetched once per document"""
+        if getattr(self, "_freelancer_details", None) is None:
+            self._freelancer_details = frappe.db.get_value(
+                "Freelancer",
+                self.freelancer,
+                ["email", "full_name", "status"],
+                as_dict=True
+            ) or frappe._dict()
+        return self._freelancer_details
+    
     def notify_parties(self) -> None:
         """Send notification to relevant parties"""
         # Notify freelancer
-        freelancer = frappe.get_doc("Freelancer", self.freelancer)
+        freelancer = self.get_freelancer_details()
         if freelancer.email:
+            # Render and queue the email in a worker, after the transaction commits
             try:
-                frappe.sendmail(
+                frappe.enqueue(
+                    "frappe.sendmail",
+                    queue="short",
+                    enqueue_after_commit=True,
                     recipients=[freelancer.email],
                     subject=_("Contract Activated: {0}").format(self.title),
                     template="contract_activated",
@@ -294,11 +368,12 @@ class FreelancerContract(Document):
     def create_calendar_events(self) -> None:
         """Create calendar events for key dates"""
         events = []
+        today = self.get_today()
         
         # Contract end date reminder (2 weeks before)
         if self.end_date:
             reminder_date = add_days(self.end_date, -14)
-            if getdate(reminder_date) > getdate(nowdate()):
+            if getdate(reminder_date) > today:
                 events.append({
                     "subject": _("Contract Ending: {0}").format(self.title),
                     "starts_on": reminder_date,
@@ -310,44 +385,45 @@ class FreelancerContract(Document):
                 })
         
         # Milestone due dates
-        if hasattr(self, 'milestones') and self.milestones:
-            for milestone in self.milestones:
-                if milestone.due_date and getdate(milestone.due_date) > getdate(nowdate()):
-                    events.append({
-                        "subject": _("Milestone Due: {0}").format(milestone.title),
-                        "starts_on": milestone.due_date,
-                        "ends_on": milestone.due_date,
-                        "event_type": "Private",
-                        "description": _("Milestone '{0}' for contract {1}").format(
-                            milestone.title, self.title
-                        )
-                    })
+        for milestone in self.get("milestones") or []:
+            if milestone.due_date and getdate(milestone.due_date) > today:
+                events.append({
+                    "subject": _("Milestone Due: {0}").format(milestone.title),
+                    "starts_on": milestone.due_date,
+                    "ends_on": milestone.due_date,
+                    "event_type": "Private",
+                    "description": _("Milestone '{0}' for contract {1}").format(
+                        milestone.title, self.title
+                    )
+                })
         
-        # Create events
+        # Create events. They are built entirely here, so write the rows
+        # directly instead of running a full insert() per event
         for event_data in events:
-            event = frappe.get_doc({
-                "doctype": "Event",
+            event = frappe.new_doc("Event")
+            event.update({
+                "owner": frappe.session.user,
                 "ref_doctype": "Freelancer Contract",
                 "ref_docname": self.name,
                 **event_data
             })
-            event.insert(ignore_permissions=True)
+            event.db_insert()
     
     def update_freelancer_status(self) -> None:
         """Update freelancer status when contract becomes active"""
-        freelancer = frappe.get_doc("Freelancer", self.freelancer)
+        freelancer = self.get_freelancer_details()
         if freelancer.status in ["Onboarding", "Inactive"]:
+            # Only the status changes, so skip the Freelancer save pipeline
+            frappe.db.set_value("Freelancer", self.freelancer, "status", "Active")
             freelancer.status = "Active"
-            freelancer.save(ignore_permissions=True)
     
     def check_pending_payments(self) -> None:
         """Check for pending payments before cancellation"""
-        pending = frappe.db.count(
-            "Freelancer Payment",
-            {"contract": self.name, "status": ["in", ["Draft", "Pending", "Approved"]]}
-        )
+        filters = {"contract": self.name, "status": ["in", ["Draft", "Pending", "Approved"]]}
         
-        if pending > 0:
+        # Count only when there is something to report
+        if frappe.db.exists("Freelancer Payment", filters):
+            pending = frappe.db.count("Freelancer Payment", filters)
             frappe.throw(
                 _("Cannot cancel contract with {0} pending payments. "
                   "Please process or cancel payments first.").format(pending)
@@ -355,17 +431,30 @@ class FreelancerContract(Document):
     
     def cancel_pending_milestones(self) -> None:
         """Cancel any pending milestones"""
-        if hasattr(self, 'milestones') and self.milestones:
-            for milestone in self.milestones:
-                if milestone.status in ["Pending", "In Progress"]:
-                    milestone.status = "Cancelled"
+        # Child rows are already written by the time on_cancel runs, so
+        # update them in the database as well as in memory
+        frappe.db.sql("""
+            UPDATE `tabFreelancer Contract Milestone`
+            SET status = 'Cancelled', modified = %s
+            WHERE parent = %s
+                AND parenttype = 'Freelancer Contract'
+                AND status IN ('Pending', 'In Progress')
+        """, (now(), self.name))
+        
+        for milestone in self.get("milestones") or []:
+            if milestone.status in ["Pending", "In Progress"]:
+                milestone.status = "Cancelled"
     
     def notify_cancellation(self) -> None:
         """Notify parties of contract cancellation"""
-        freelancer = frappe.get_doc("Freelancer", self.freelancer)
+        freelancer = self.get_freelancer_details()
         if freelancer.email:
+            # Render and queue the email in a worker, after the transaction commits
             try:
-                frappe.sendmail(
+                frappe.enqueue(
+                    "frappe.sendmail",
+                    queue="short",
+                    enqueue_after_commit=True,
                     recipients=[freelancer.email],
                     subject=_("Contract Cancelled: {0}").format(self.title),
                     template="contract_cancelled",
@@ -380,7 +469,29 @@ class FreelancerContract(Document):
                 frappe.log_error(f"Failed to send cancellation notification: {str(e)}")
 
 
+def on_doctype_update() -> None:
+    """Add composite index for the expiring contracts query"""
+    frappe.db.add_index("Freelancer Contract", ["docstatus", "status", "end_date"])
+
+
 # Hook functions
+def get_billable_months(start: date, end: date) -> int:
+    """
+    Whole calendar months from start to end, with the end date inclusive
+    
+    1 Jan - 31 Dec is 12 months and 31 Jan - 28 Feb is 1. Leftover days
+    short of a month are not billed, but a contract shorter than a month
+    still counts as one.
+    """
+    end_exclusive = end + timedelta(days=1)
+    months = (
+        (end_exclusive.year - start.year) * 12
+        + (end_exclusive.month - start.month)
+        - int(end_exclusive.day < start.day)
+    )
+    return max(months, 1)
+
+
 def validate_contract(doc: FreelancerContract, method: str = None) -> None:
     """Hook for validate event"""
     doc.validate()
@@ -396,6 +507,21 @@ def before_cancel(doc: FreelancerContract, method: str = None) -> None:
     pass  # Main logic in document class
 
 
+def get_contract_values(contract: str, fields: List[str]) -> Dict[str, Any]:
+    """
+    Read a few Freelancer Contract fields without loading the full document
+    
+    Raises DoesNotExistError like frappe.get_doc when the contract is missing.
+    """
+    values = frappe.db.get_value("Freelancer Contract", contract, fields, as_dict=True)
+    if not values:
+        frappe.throw(
+            _("Freelancer Contract {0} not found").format(contract),
+            frappe.DoesNotExistError
+        )
+    return values
+
+
 @frappe.whitelist()
 def create_payment_from_contract(contract: str) -> str:
     """
@@ -407,8 +533,11 @@ def create_payment_from_contract(contract: str) -> str:
     Returns:
         Name of created payment
     """
-    contract_doc = frappe.get_doc("Freelancer Contract", contract)
-    freelancer_doc = frappe.get_doc("Freelancer", contract_doc.freelancer)
+    contract_doc = get_contract_values(contract, [
+        "freelancer", "freelancer_name", "company", "currency", "billing_type", "rate",
+        "withholding_tax_applicable", "withholding_tax_rate",
+        "vat_applicable", "vat_rate", "reverse_charge"
+    ])
     
     payment = frappe.get_doc({
         "doctype": "Freelancer Payment",
@@ -458,27 +587,26 @@ def renew_contract(contract: str, extension_months: int = 12) -> str:
     new_start = add_days(old_contract.end_date, 1) if old_contract.end_date else nowdate()
     new_end = add_months(new_start, extension_months)
     
-    # Create new contract (amended)
-    new_contract = frappe.copy_doc(old_contract)
-    new_contract.start_date = new_start
-    new_contract.end_date = new_end
-    new_contract.status = "Draft"
-    new_contract.amended_from = contract
-    new_contract.total_invoiced = 0
-    new_contract.total_paid = 0
-    new_contract.outstanding_amount = 0
-    new_contract.hours_logged = 0
-    new_contract.milestones_completed = 0
-    new_contract.completion_percentage = 0
-    
-    # Clear milestones (will be re-created)
-    new_contract.milestones = []
-    
+    # Create new contract (amended) from the carried-over terms only;
+    # milestones are not copied (will be re-created) and the progress
+    # fields start at zero
+    new_contract = frappe.get_doc({
+        "doctype": "Freelancer Contract",
+        **{field: old_contract.get(field) for field in RENEWAL_COPY_FIELDS},
+        "other_documents": [
+            d.as_dict(no_default_fields=True) for d in old_contract.get("other_documents") or []
+        ],
+        "start_date": new_start,
+        "end_date": new_end,
+        "status": "Draft",
+        "amended_from": contract
+    })
     new_contract.insert()
     
     # Mark old contract as expired if it was active
     if old_contract.status == "Active":
         old_contract.db_set("status", "Expired")
+        clear_expiring_contracts_cache()
     
     frappe.msgprint(
         _("Contract renewed. New contract: {0}").format(new_contract.name),
@@ -511,12 +639,13 @@ def terminate_contract(
         frappe.throw(_("Can only terminate active or on-hold contracts"))
     
     # Set termination date
-    term_date = getdate(termination_date) if termination_date else getdate(nowdate())
+    today = contract_doc.get_today()
+    term_date = getdate(termination_date) if termination_date else today
     
     # Check notice period
     if contract_doc.notice_period_days:
-        min_term_date = add_days(nowdate(), contract_doc.notice_period_days)
-        if term_date < getdate(min_term_date):
+        min_term_date = add_days(today, contract_doc.notice_period_days)
+        if term_date < min_term_date:
             frappe.msgprint(
                 _("Notice period of {0} days applies. Minimum termination date: {1}").format(
                     contract_doc.notice_period_days, min_term_date
@@ -525,8 +654,8 @@ def terminate_contract(
             )
     
     # Update contract
-    contract_doc.db_set("status", "Terminated")
-    contract_doc.db_set("termination_date", term_date)
+    contract_doc.db_set({"status": "Terminated", "termination_date": term_date})
+    clear_expiring_contracts_cache()
     
     # Add comment
     frappe.get_doc({
@@ -559,47 +688,59 @@ def get_contract_summary(contract: str) -> Dict[str, Any]:
     Returns:
         Dictionary with summary data
     """
-    contract_doc = frappe.get_doc("Freelancer Contract", contract)
+    # Contract fields, payment and milestone statistics in one round trip
+    result = frappe.db.sql("""
+        SELECT
+            c.total_value, c.end_date, c.status,
+            p.total_invoiced, p.total_paid, p.pending_count,
+            m.total, m.completed
+        FROM `tabFreelancer Contract` c
+        CROSS JOIN (
+            SELECT 
+                COALESCE(SUM(CASE WHEN docstatus = 1 THEN gross_amount ELSE 0 END), 0) as total_invoiced,
+                COALESCE(SUM(CASE WHEN docstatus = 1 AND status = 'Paid' THEN net_amount ELSE 0 END), 0) as total_paid,
+                COUNT(CASE WHEN status IN ('Draft', 'Pending', 'Approved') THEN 1 END) as pending_count
+            FROM `tabFreelancer Payment`
+            WHERE contract = %(contract)s
+        ) p
+        CROSS JOIN (
+            SELECT 
+                COUNT(*) as total,
+                COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed
+            FROM `tabFreelancer Milestone`
+            WHERE contract = %(contract)s
+        ) m
+        WHERE c.name = %(contract)s
+    """, {"contract": contract}, as_dict=True)
+    
+    if not result:
+        frappe.throw(
+            _("Freelancer Contract {0} not found").format(contract),
+            frappe.DoesNotExistError
+        )
     
-    # Payment statistics
-    payments = frappe.db.sql("""
-        SELECT 
-            COALESCE(SUM(CASE WHEN docstatus = 1 THEN gross_amount ELSE 0 END), 0) as total_invoiced,
-            COALESCE(SUM(CASE WHEN docstatus = 1 AND status = 'Paid' THEN net_amount ELSE 0 END), 0) as total_paid,
-            COUNT(CASE WHEN status IN ('Draft', 'Pending', 'Approved') THEN 1 END) as pending_count
-        FROM `tabFreelancer Payment`
-        WHERE contract = %s
-    """, contract, as_dict=True)[0]
-    
-    # Milestone statistics
-    milestones = frappe.db.sql("""
-        SELECT 
-            COUNT(*) as total,
-            COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed
-        FROM `tabFreelancer Milestone`
-        WHERE contract = %s
-    """, contract, as_dict=True)[0]
+    summary = result[0]
     
     # Calculate remaining value
-    remaining = flt(contract_doc.total_value or 0) - flt(payments.total_invoiced)
+    remaining = flt(summary.total_value or 0) - flt(summary.total_invoiced)
     
     # Days until expiry
     days_remaining = None
-    if contract_doc.end_date:
-        days_remaining = date_diff(contract_doc.end_date, nowdate())
+    if summary.end_date:
+        days_remaining = date_diff(summary.end_date, nowdate())
     
     return {
-        "contract_value": contract_doc.total_value,
-        "total_invoiced": payments.total_invoiced,
-        "total_paid": payments.total_paid,
-        "outstanding": flt(payments.total_invoiced) - flt(payments.total_paid),
+        "contract_value": summary.total_value,
+        "total_invoiced": summary.total_invoiced,
+        "total_paid": summary.total_paid,
+        "outstanding": flt(summary.total_invoiced) - flt(summary.total_paid),
         "remaining_value": remaining,
-        "pending_payments": payments.pending_count,
-        "total_milestones": milestones.total,
-        "completed_milestones": milestones.completed,
-        "completion_pct": (milestones.completed / milestones.total * 100) if milestones.total else 0,
+        "pending_payments": summary.pending_count,
+        "total_milestones": summary.total,
+        "completed_milestones": summary.completed,
+        "completion_pct": (summary.completed / summary.total * 100) if summary.total else 0,
         "days_remaining": days_remaining,
-        "status": contract_doc.status
+        "status": summary.status
     }
 
 
@@ -608,13 +749,31 @@ def get_expiring_contracts(days: int = 30) -> List[Dict[str, Any]]:
     """
     Get contracts expiring within specified days
     
+    Results are cached in Redis per day for up to an hour, and cleared
+    whenever a contract change is committed.
+    
     Args:
         days: Number of days to look ahead
         
     Returns:
         List of expiring contracts
     """
-    expiry_date = add_days(nowdate(), days)
+    days = cint(days)
+    today = nowdate()
+    
+    key = f"{EXPIRING_CONTRACTS_CACHE_KEY}:{today}:{days}"
+    
+    contracts = frappe.cache().get_value(key)
+    if contracts is None:
+        contracts = _get_expiring_contracts(days, today)
+        frappe.cache().set_value(key, contracts, expires_in_sec=EXPIRING_CONTRACTS_CACHE_TTL)
+    
+    return contracts
+
+
+def _get_expiring_contracts(days: int, today: str) -> List[Dict[str, Any]]:
+    """Query active contracts ending between today and today + days"""
+    expiry_date = add_days(today, days)
     
     contracts = frappe.db.sql("""
         SELECT 
@@ -627,6 +786,16 @@ def get_expiring_contracts(days: int = 30) -> List[Dict[str, Any]]:
         AND end_date <= %s
         AND end_date >= %s
         ORDER BY end_date ASC
-    """, (expiry_date, nowdate()), as_dict=True)
+    """, (expiry_date, today), as_dict=True)
     
     return contracts
+
+
+def clear_expiring_contracts_cache() -> None:
+    """Drop all cached expiring contract lists once the transaction commits"""
+    frappe.db.after_commit.add(_delete_expiring_contracts_cache)
+
+
+def _delete_expiring_contracts_cache() -> None:
+    """Delete every cached expiring contract list"""
+    frappe.cache().delete_keys(f"{EXPIRING_CONTRACTS_CACHE_KEY}:")
@@ -3,18 +3,62 @@ Freelancer Payment DocType Controller
 Handles invoice-based payments with tax calculations for EU and international freelancers
 """
 
-from typing import TYPE_CHECKING, Optional, Dict, Any, List
-from datetime import date, datetime
+import math
+from operator import attrgetter
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Iterable, Tuple
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import getdate, nowdate, add_days, flt, cint, money_in_words
+from frappe.utils import getdate, nowdate, add_days, flt
+
+from hrms_freelancer.hrms_freelancer.doctype.freelancer.freelancer import get_freelancer_values
+from hrms_freelancer.hrms_freelancer.doctype.freelancer_payment_item.freelancer_payment_item import (
+    get_item_amount
+)
 
 if TYPE_CHECKING:
     from frappe.types import DF
 
 
+_get_amount = attrgetter("amount")
+
+
+def sum_amounts(rows: Iterable[Any]) -> float:
+    """Sum the amount field of child rows"""
+    amounts = list(map(_get_amount, rows))
+    try:
+        return math.fsum(amounts)
+    except TypeError:
+        # Some amount is empty or a string, coerce all of them
+        return math.fsum(map(flt, amounts))
+
+
+# Freelancer fields read by get_payment_freelancer
+_PAYMENT_FREELANCER_FIELDS = ["name", "status", "email", "full_name", "tax_id"]
+
+# Fixed compliance notes, see FreelancerPayment.set_compliance_notes
+_NOTE_REVERSE_CHARGE = (
+    "EU Reverse Charge Applied: VAT is 0% on invoice. "
+    "The recipient (company) is responsible for VAT accounting."
+)
+_NOTE_1099 = (
+    "US 1099 Reporting: This payment may be reportable to the IRS. "
+    "Ensure W-8BEN or W-9 is on file."
+)
+_NOTE_LARGE_PAYMENT = (
+    "Large Payment: May require additional compliance checks. "
+    "Verify anti-money laundering (AML) requirements."
+)
+
+# Redis key of the cached get_payment_approvers list and its expiry
+PAYMENT_APPROVERS_CACHE_KEY = "freelancer_payment_approvers"
+PAYMENT_APPROVERS_CACHE_TTL = 60 * 60
+
+# Redis hash of get_vat_account results by company
+VAT_ACCOUNT_CACHE_KEY = "freelancer_vat_account"
+
+
 class FreelancerPayment(Document):
     """
     Freelancer Payment DocType
@@ -85,7 +129,7 @@ class FreelancerPayment(Document):
     def validate_freelancer_status(self) -> None:
         """Ensure freelancer is active"""
         if self.freelancer:
-            status = frappe.db.get_value("Freelancer", self.freelancer, "status")
+            status = get_payment_freelancer(self.freelancer).status
             if status in ["Blacklisted", "Offboarding"]:
                 frappe.throw(
                     _("Cannot create payment for freelancer with status: {0}").format(status)
@@ -94,9 +138,8 @@ class FreelancerPayment(Document):
     def validate_contract(self) -> None:
         """Validate contract reference if provided"""
         if self.contract:
-            contract_status = frappe.db.get_value(
-                "Freelancer Contract", self.contract, "status"
-            )
+            contract = self.get_contract_details()
+            contract_status = contract.status
             if contract_status not in ["Active", "Completed"]:
                 frappe.msgprint(
                     _("Warning: Contract status is {0}. Payments are typically "
@@ -105,12 +148,22 @@ class FreelancerPayment(Document):
                 )
             
             # Verify contract belongs to this freelancer
-            contract_freelancer = frappe.db.get_value(
-                "Freelancer Contract", self.contract, "freelancer"
-            )
-            if contract_freelancer != self.freelancer:
+            if contract.freelancer != self.freelancer:
                 frappe.throw(_("Contract does not belong to selected freelancer"))
     
+    def get_contract_details(self) -> Dict[str, Any]:
+        """Get status, freelancer and payment terms of the linked contract in one query"""
+        cached = getattr(self, "_contract_cache", None)
+        if cached is None or cached[0] != self.contract:
+            details = frappe.db.get_value(
+                "Freelancer Contract",
+                self.contract,
+                ["status", "freelancer", "payment_terms"],
+                as_dict=True
+            ) or frappe._dict()
+            cached = self._contract_cache = (self.contract, details)
+        return cached[1]
+    
     def validate_dates(self) -> None:
         """Validate payment period dates"""
         if self.payment_period_start and self.payment_period_end:
@@ -122,14 +175,10 @@ class FreelancerPayment(Document):
             # Default to 30 days from posting
             days = 30
             if self.contract:
-                payment_terms = frappe.db.get_value(
-                    "Freelancer Contract", self.contract, "payment_terms"
-                )
+                payment_terms = self.get_contract_details().payment_terms
                 if payment_terms:
-                    # Get days from payment terms template
-                    terms_doc = frappe.get_doc("Payment Terms Template", payment_terms)
-                    if terms_doc.terms:
-                        days = terms_doc.terms[0].credit_days or 30
+                    # Get days from the first term of the payment terms template
+                    days = get_first_term_credit_days(payment_terms) or 30
             
             self.due_date = add_days(self.posting_date, days)
     
@@ -138,22 +187,45 @@ class FreelancerPayment(Document):
         # Base amount
         self.base_amount = flt(self.rate) * flt(self.quantity)
         
+        payment_items = self.get("payment_items")
+        milestones = self.get("milestones")
+        expense_reimbursements = self.get("expense_reimbursements")
+        
+        # Fast path: plain rate x quantity with no line items, expenses,
+        # taxes or currency conversion, where every total is the base amount
+        if not (
+            self.vat_applicable
+            or self.withholding_tax_applicable
+            or payment_items
+            or milestones
+            or expense_reimbursements
+            or flt(self.exchange_rate or 1) != 1
+        ):
+            self.total_expenses = 0
+            self.vat_amount = 0
+            self.withholding_tax_amount = 0
+            self.total_deductions = 0
+            self.gross_amount = self.gross_with_vat = self.net_amount = self.base_amount
+            self.base_amount_company_currency = self.net_amount_company_currency = self.base_amount
+            return
+        
         # Add line items if present
-        if hasattr(self, 'payment_items') and self.payment_items:
-            items_total = sum(flt(item.amount) for item in self.payment_items)
+        if payment_items:
+            self.set_item_amounts()
+            items_total = sum_amounts(payment_items)
             if items_total > 0:
                 self.base_amount = items_total
         
         # Add milestone amounts if milestone-based
-        if self.billing_type == "Milestone-Based" and hasattr(self, 'milestones') and self.milestones:
-            milestone_total = sum(flt(m.amount) for m in self.milestones)
+        if self.billing_type == "Milestone-Based" and milestones:
+            milestone_total = sum_amounts(milestones)
             if milestone_total > 0:
                 self.base_amount = milestone_total
         
         # Calculate expenses
         self.total_expenses = 0
-        if hasattr(self, 'expense_reimbursements') and self.expense_reimbursements:
-            self.total_expenses = sum(flt(e.amount) for e in self.expense_reimbursements)
+        if expense_reimbursements:
+            self.total_expenses = sum_amounts(expense_reimbursements)
         
         # Gross amount (base + expenses)
         self.gross_amount = flt(self.base_amount) + flt(self.total_expenses)
@@ -188,16 +260,18 @@ class FreelancerPayment(Document):
         self.base_amount_company_currency = flt(self.base_amount) * flt(self.exchange_rate or 1)
         self.net_amount_company_currency = flt(self.net_amount) * flt(self.exchange_rate or 1)
     
+    def set_item_amounts(self) -> None:
+        """Compute amount = quantity * rate for all line items in one pass"""
+        for item in self.payment_items:
+            item.amount = get_item_amount(item.quantity, item.rate)
+    
     def set_compliance_notes(self) -> None:
         """Set compliance notes based on payment characteristics"""
         notes = []
         
         # EU reverse charge
         if self.reverse_charge:
-            notes.append(
-                "EU Reverse Charge Applied: VAT is 0% on invoice. "
-                "The recipient (company) is responsible for VAT accounting."
-            )
+            notes.append(_NOTE_REVERSE_CHARGE)
         
         # Withholding tax
         if self.withholding_tax_applicable and self.withholding_tax_amount > 0:
@@ -212,17 +286,11 @@ class FreelancerPayment(Document):
         
         # 1099 reporting
         if self.form_1099_applicable:
-            notes.append(
-                "US 1099 Reporting: This payment may be reportable to the IRS. "
-                "Ensure W-8BEN or W-9 is on file."
-            )
+            notes.append(_NOTE_1099)
         
         # Large payment warning
         if self.gross_amount and self.gross_amount > 10000:
-            notes.append(
-                "Large Payment: May require additional compliance checks. "
-                "Verify anti-money laundering (AML) requirements."
-            )
+            notes.append(_NOTE_LARGE_PAYMENT)
         
         self.compliance_notes = "\n".join(notes) if notes else None
     
@@ -242,21 +310,23 @@ class FreelancerPayment(Document):
     def update_contract_totals(self) -> None:
         """Update contract totals after payment submission"""
         if self.contract:
-            # Update total invoiced
+            # Update total invoiced and outstanding
             frappe.db.sql("""
                 UPDATE `tabFreelancer Contract`
-                SET total_invoiced = COALESCE(total_invoiced, 0) + %s
-                WHERE name = %s
-            """, (self.gross_amount, self.contract))
+                SET total_invoiced = COALESCE(total_invoiced, 0) + %(amount)s,
+                    outstanding_amount = COALESCE(outstanding_amount, 0) + %(amount)s
+                WHERE name = %(contract)s
+            """, {"amount": self.gross_amount, "contract": self.contract})
     
     def reverse_contract_totals(self) -> None:
         """Reverse contract totals on cancellation"""
         if self.contract:
             frappe.db.sql("""
                 UPDATE `tabFreelancer Contract`
-                SET total_invoiced = COALESCE(total_invoiced, 0) - %s
-                WHERE name = %s
-            """, (self.gross_amount, self.contract))
+                SET total_invoiced = COALESCE(total_invoiced, 0) - %(amount)s,
+                    outstanding_amount = COALESCE(outstanding_amount, 0) - %(amount)s
+                WHERE name = %(contract)s
+            """, {"amount": self.gross_amount, "contract": self.contract})
     
     def notify_approval_required(self) -> None:
         """Send notification for payment approval"""
@@ -277,15 +347,14 @@ class FreelancerPayment(Document):
     
     def cancel_linked_documents(self) -> None:
         """Cancel linked accounting documents"""
+        # Only load the documents that are still submitted
         if self.erp_invoice:
-            invoice = frappe.get_doc("Purchase Invoice", self.erp_invoice)
-            if invoice.docstatus == 1:
-                invoice.cancel()
+            if frappe.db.get_value("Purchase Invoice", self.erp_invoice, "docstatus") == 1:
+                frappe.get_doc("Purchase Invoice", self.erp_invoice).cancel()
         
         if self.journal_entry:
-            je = frappe.get_doc("Journal Entry", self.journal_entry)
-            if je.docstatus == 1:
-                je.cancel()
+            if frappe.db.get_value("Journal Entry", self.journal_entry, "docstatus") == 1:
+                frappe.get_doc("Journal Entry", self.journal_entry).cancel()
 
 
 # Hook functions
@@ -304,18 +373,68 @@ def on_cancel(doc: FreelancerPayment, method: str = None) -> None:
     pass
 
 
+def get_payment_freelancer(freelancer: str) -> Dict[str, Any]:
+    """Get the Freelancer fields used by payments, memoized per request"""
+    if not hasattr(frappe.local, "payment_freelancers"):
+        frappe.local.payment_freelancers = {}
+    
+    cache = frappe.local.payment_freelancers
+    if freelancer not in cache:
+        cache[freelancer] = get_freelancer_values(freelancer, _PAYMENT_FREELANCER_FIELDS)
+    return cache[freelancer]
+
+
+def get_first_term_credit_days(payment_terms_template: str) -> Optional[int]:
+    """Get credit days of the first term in a Payment Terms Template, memoized per request"""
+    if not hasattr(frappe.local, "payment_terms_credit_days"):
+        frappe.local.payment_terms_credit_days = {}
+    
+    cache = frappe.local.payment_terms_credit_days
+    if payment_terms_template not in cache:
+        cache[payment_terms_template] = frappe.db.get_value(
+            "Payment Terms Template Detail",
+            {"parent": payment_terms_template, "parenttype": "Payment Terms Template"},
+            "credit_days",
+            order_by="idx asc"
+        )
+    return cache[payment_terms_template]
+
+
 def get_payment_approvers(company: str) -> List[str]:
     """Get list of users who can approve payments"""
-    # Get users with Freelancer Accountant or HR Manager role
-    approvers = frappe.db.sql("""
-        SELECT DISTINCT u.name
-        FROM `tabUser` u
-        INNER JOIN `tabHas Role` hr ON hr.parent = u.name
+    # The approver roles are not company specific, so one cached list serves all companies
+    approvers = frappe.cache().get_value(PAYMENT_APPROVERS_CACHE_KEY)
+    if approvers is None:
+        approvers = _get_payment_approvers()
+        frappe.cache().set_value(
+            PAYMENT_APPROVERS_CACHE_KEY, approvers, expires_in_sec=PAYMENT_APPROVERS_CACHE_TTL
+        )
+    return approvers
+
+
+def _get_payment_approvers() -> List[str]:
+    """Query enabled users with a payment approver role"""
+    # Get users with Freelancer Accountant or HR Manager role, driven
+    # from the (role, parent) index on Has Role
+    return frappe.db.sql_list("""
+        SELECT DISTINCT hr.parent
+        FROM `tabHas Role` hr
         WHERE hr.role IN ('Freelancer Accountant', 'HR Manager', 'System Manager')
-        AND u.enabled = 1
-    """, as_dict=True)
-    
-    return [a.name for a in approvers]
+        AND hr.parenttype = 'User'
+        AND hr.parent IN (SELECT u.name FROM `tabUser` u WHERE u.enabled = 1)
+    """)
+
+
+def clear_vat_account_cache(doc: Document = None, method: str = None, *args) -> None:
+    """Drop cached VAT accounts, hooked to Account changes"""
+    # After commit, so a concurrent request can't cache the old account again
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(VAT_ACCOUNT_CACHE_KEY))
+
+
+def clear_payment_approvers_cache(doc: Document = None, method: str = None) -> None:
+    """Drop the cached approver list, hooked to User changes (roles are saved with the user)"""
+    # After commit, so a concurrent request can't cache the old roles again
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(PAYMENT_APPROVERS_CACHE_KEY))
 
 
 @frappe.whitelist()
@@ -338,27 +457,115 @@ def approve_payment(payment: str) -> None:
     if not frappe.has_permission("Freelancer Payment", "submit", doc):
         frappe.throw(_("You don't have permission to approve payments"))
     
-    doc.db_set("status", "Approved")
-    doc.db_set("approved_by", frappe.session.user)
-    doc.db_set("approval_date", frappe.utils.now_datetime())
+    doc.db_set({
+        "status": "Approved",
+        "approved_by": frappe.session.user,
+        "approval_date": frappe.utils.now_datetime()
+    })
     
     # Notify freelancer
-    freelancer = frappe.get_doc("Freelancer", doc.freelancer)
+    send_payment_approved_email(doc, get_payment_freelancer(doc.freelancer))
+    
+    frappe.msgprint(_("Payment approved"), indicator="green")
+
+
+@frappe.whitelist()
+def bulk_approve_payments(payments: List[str]) -> List[str]:
+    """
+    Approve several freelancer payments at once
+    
+    All payments are checked first, so either every payment is approved
+    or none is.
+    
+    Args:
+        payments: List (or JSON list) of payment document names
+        
+    Returns:
+        Names of the approved payments
+    """
+    if isinstance(payments, str):
+        payments = frappe.parse_json(payments)
+    
+    payments = list(dict.fromkeys(payments))
+    if not payments:
+        return []
+    
+    # All columns, so the permission check can work on documents built
+    # from these rows instead of loading each payment again
+    rows = frappe.get_all(
+        "Freelancer Payment",
+        filters={"name": ["in", payments]},
+        fields=["*"],
+        limit_page_length=0
+    )
+    rows_by_name = {row.name: row for row in rows}
+    
+    for payment in payments:
+        row = rows_by_name.get(payment)
+        if not row:
+            frappe.throw(
+                _("Freelancer Payment {0} not found").format(payment),
+                frappe.DoesNotExistError
+            )
+        
+        if row.docstatus != 1:
+            frappe.throw(_("Payment {0} must be submitted before approval").format(payment))
+        
+        if row.status not in ["Pending Approval", "Invoice Received"]:
+            frappe.throw(_("Payment {0} is not pending approval").format(payment))
+        
+        doc = frappe.get_doc({"doctype": "Freelancer Payment", **row})
+        if not frappe.has_permission("Freelancer Payment", "submit", doc):
+            frappe.throw(_("You don't have permission to approve payments"))
+    
+    # One UPDATE for all payments
+    frappe.db.set_value(
+        "Freelancer Payment",
+        {"name": ["in", payments]},
+        {
+            "status": "Approved",
+            "approved_by": frappe.session.user,
+            "approval_date": frappe.utils.now_datetime()
+        }
+    )
+    
+    # Notify freelancers, reading all of them in one query
+    freelancers = {
+        f.name: f for f in frappe.get_all(
+            "Freelancer",
+            filters={"name": ["in", list({row.freelancer for row in rows})]},
+            fields=["name", "email", "full_name"],
+            limit_page_length=0
+        )
+    }
+    for row in rows:
+        freelancer = freelancers.get(row.freelancer)
+        if freelancer:
+            send_payment_approved_email(row, freelancer)
+    
+    frappe.msgprint(
+        _("{0} payments approved").format(len(payments)),
+        indicator="green"
+    )
+    
+    return payments
+
+
+def send_payment_approved_email(payment: Dict[str, Any], freelancer: Dict[str, Any]) -> None:
+    """Queue the payment approved email to the freelancer"""
     if freelancer.email:
         frappe.sendmail(
             recipients=[freelancer.email],
-            subject=_("Payment Approved: {0}").format(doc.name),
+            subject=_("Payment Approved: {0}").format(payment.name),
             template="payment_approved",
             args={
                 "freelancer_name": freelancer.full_name,
-                "payment_name": doc.name,
-                "amount": f"{doc.currency} {doc.net_amount:,.2f}",
-                "due_date": doc.due_date
+                "payment_name": payment.name,
+                "amount": f"{payment.currency} {flt(payment.net_amount):,.2f}",
+                "due_date": payment.due_date
             },
             delayed=True
         )
-    
-    frappe.msgprint(_("Payment approved"), indicator="green")
 
 
 @frappe.whitelist()
@@ -378,8 +585,7 @@ def reject_payment(payment: str, reason: str = None) -> None:
     if doc.status not in ["Pending Approval", "Invoice Received"]:
         frappe.throw(_("Payment is not pending approval"))
     
-    doc.db_set("status", "Rejected")
-    doc.db_set("rejection_reason", reason or "Not specified")
+    doc.db_set({"status": "Rejected", "rejection_reason": reason or "Not specified"})
     
     frappe.msgprint(_("Payment rejected"), indicator="red")
 
@@ -404,14 +610,13 @@ def create_purchase_invoice(payment: str) -> str:
         frappe.throw(_("Purchase Invoice already created: {0}").format(doc.erp_invoice))
     
     # Get freelancer details for supplier
-    freelancer = frappe.get_doc("Freelancer", doc.freelancer)
+    freelancer = get_payment_freelancer(doc.freelancer)
     
     # Find or create supplier
     supplier = get_or_create_supplier(freelancer)
     
     # Get expense account
-    company_doc = frappe.get_doc("Company", doc.company)
-    expense_account = company_doc.default_expense_account or \
+    expense_account = frappe.get_cached_value("Company", doc.company, "default_expense_account") or \
                       frappe.db.get_value("Account", 
                           {"company": doc.company, "account_type": "Expense Account"}, 
                           "name")
@@ -503,7 +708,9 @@ def create_withholding_journal_entry(payment: str) -> str:
     if doc.journal_entry:
         frappe.throw(_("Journal Entry already created: {0}").format(doc.journal_entry))
     
-    company_doc = frappe.get_doc("Company", doc.company)
+    default_payable_account = frappe.get_cached_value(
+        "Company", doc.company, "default_payable_account"
+    )
     
     # Get withholding tax liability account
     wht_account = frappe.db.get_value("Account", {
@@ -516,11 +723,16 @@ def create_withholding_journal_entry(payment: str) -> str:
         wht_account = frappe.get_doc({
             "doctype": "Account",
             "account_name": "Withholding Tax Payable",
-            "parent_account": company_doc.default_payable_account,
+            "parent_account": default_payable_account,
             "company": doc.company,
             "account_type": "Payable"
         }).insert().name
     
+    # Freelancer fields are only read when the supplier has to be created
+    supplier = get_supplier_name_for_freelancer(doc.freelancer) or get_or_create_supplier(
+        get_payment_freelancer(doc.freelancer)
+    )
+    
     # Create Journal Entry
     je = frappe.get_doc({
         "doctype": "Journal Entry",
@@ -530,9 +742,9 @@ def create_withholding_journal_entry(payment: str) -> str:
         "user_remark": f"Withholding tax for {doc.freelancer_name} - Payment {doc.name}",
         "accounts": [
             {
-                "account": company_doc.default_payable_account,
+                "account": default_payable_account,
                 "party_type": "Supplier",
-                "party": get_or_create_supplier(frappe.get_doc("Freelancer", doc.freelancer)),
+                "party": supplier,
                 "debit_in_account_currency": doc.withholding_tax_amount,
                 "reference_type": "Freelancer Payment",
                 "reference_name": doc.name
@@ -577,22 +789,23 @@ def mark_as_paid(
     if doc.status not in ["Approved", "Processing"]:
         frappe.throw(_("Payment must be approved before marking as paid"))
     
-    doc.db_set("status", "Paid")
-    doc.db_set("payment_date", payment_date or nowdate())
+    values = {"status": "Paid", "payment_date": payment_date or nowdate()}
     if payment_reference:
-        doc.db_set("payment_reference", payment_reference)
+        values["payment_reference"] = payment_reference
+    doc.db_set(values)
     
-    # Update contract totals
+    # Update contract totals; outstanding is kept as a running balance
+    # so it does not depend on the order SET clauses are evaluated in
     if doc.contract:
         frappe.db.sql("""
             UPDATE `tabFreelancer Contract`
-            SET total_paid = COALESCE(total_paid, 0) + %s,
-                outstanding_amount = COALESCE(total_invoiced, 0) - COALESCE(total_paid, 0) - %s
-            WHERE name = %s
-        """, (doc.net_amount, doc.net_amount, doc.contract))
+            SET total_paid = COALESCE(total_paid, 0) + %(amount)s,
+                outstanding_amount = COALESCE(outstanding_amount, 0) - %(amount)s
+            WHERE name = %(contract)s
+        """, {"amount": doc.net_amount, "contract": doc.contract})
     
     # Notify freelancer
-    freelancer = frappe.get_doc("Freelancer", doc.freelancer)
+    freelancer = get_payment_freelancer(doc.freelancer)
     if freelancer.email:
         frappe.sendmail(
             recipients=[freelancer.email],
@@ -647,17 +860,16 @@ def export_pdf(payment: str) -> str:
     return file_doc.file_url
 
 
-def get_or_create_supplier(freelancer: Document) -> str:
-    """Get or create supplier from freelancer"""
-    supplier_name = f"FRL-{freelancer.name}"
-    
-    if frappe.db.exists("Supplier", supplier_name):
-        return supplier_name
+def get_or_create_supplier(freelancer: Dict[str, Any]) -> str:
+    """Get or create supplier from freelancer (document or dict with name and tax_id)"""
+    existing = get_supplier_name_for_freelancer(freelancer.name)
+    if existing:
+        return existing
     
     # Create new supplier
     supplier = frappe.get_doc({
         "doctype": "Supplier",
-        "supplier_name": supplier_name,
+        "supplier_name": f"FRL-{freelancer.name}",
         "supplier_group": "Services",
         "supplier_type": "Individual",
         "tax_id": freelancer.tax_id,
@@ -668,8 +880,23 @@ def get_or_create_supplier(freelancer: Document) -> str:
     return supplier.name
 
 
+def get_supplier_name_for_freelancer(freelancer: str) -> Optional[str]:
+    """Get the name of the freelancer's supplier if it exists"""
+    supplier_name = f"FRL-{freelancer}"
+    return supplier_name if frappe.db.exists("Supplier", supplier_name) else None
+
+
 def get_vat_account(company: str) -> Optional[str]:
     """Get VAT/Input Tax account for company"""
+    return frappe.cache().hget(
+        VAT_ACCOUNT_CACHE_KEY,
+        company,
+        generator=lambda: _get_vat_account(company)
+    )
+
+
+def _get_vat_account(company: str) -> Optional[str]:
+    """Query the VAT/Input Tax account for company"""
     return frappe.db.get_value("Account", {
         "company": company,
         "account_type": "Tax",
@@ -701,28 +928,21 @@ def calculate_payment_preview(
     Returns:
         Dictionary with calculated amounts
     """
-    freelancer_doc = frappe.get_doc("Freelancer", freelancer)
-    
-    base_amount = flt(rate) * flt(quantity)
-    gross_amount = base_amount + flt(expenses)
-    
-    # VAT
-    vat_amount = 0
-    if freelancer_doc.vat_registered and not freelancer_doc.reverse_charge_applicable:
-        vat_amount = gross_amount * flt(freelancer_doc.vat_rate) / 100
-    
-    gross_with_vat = gross_amount + vat_amount
-    
-    # Withholding
-    withholding_amount = 0
-    if freelancer_doc.withholding_tax_rate > 0:
-        withholding_amount = gross_amount * flt(freelancer_doc.withholding_tax_rate) / 100
-    
-    # Net
-    if freelancer_doc.reverse_charge_applicable:
-        net_amount = gross_amount - withholding_amount
-    else:
-        net_amount = gross_with_vat - withholding_amount
+    freelancer_doc = get_freelancer_values(freelancer, [
+        "vat_registered", "vat_rate", "reverse_charge_applicable",
+        "withholding_tax_rate", "currency", "residency_status", "is_eu_country"
+    ])
+    
+    base_amount, gross_amount, vat_amount, gross_with_vat, withholding_amount, net_amount = (
+        _preview_amounts(
+            flt(rate),
+            flt(quantity),
+            flt(expenses),
+            flt(freelancer_doc.vat_rate) if freelancer_doc.vat_registered else 0.0,
+            flt(freelancer_doc.withholding_tax_rate),
+            bool(freelancer_doc.reverse_charge_applicable)
+        )
+    )
     
     return {
         "base_amount": base_amount,
@@ -733,7 +953,7 @@ def calculate_payment_preview(
         "vat_amount": vat_amount,
         "reverse_charge": freelancer_doc.reverse_charge_applicable,
         "gross_with_vat": gross_with_vat,
-        "withholding_applicable": freelancer_doc.withholding_tax_rate > 0,
+        "withholding_applicable": flt(freelancer_doc.withholding_tax_rate) > 0,
         "withholding_rate": freelancer_doc.withholding_tax_rate,
         "withholding_amount": withholding_amount,
         "net_amount": net_amount,
@@ -741,3 +961,34 @@ def calculate_payment_preview(
         "residency_status": freelancer_doc.residency_status,
         "is_eu": freelancer_doc.is_eu_country
     }
+
+
+def _preview_amounts(
+    rate: float,
+    quantity: float,
+    expenses: float,
+    vat_rate: float,
+    withholding_rate: float,
+    reverse_charge: bool
+) -> Tuple[float, ...]:
+    """
+    Payment preview arithmetic on plain floats
+    
+    Returns (base, gross, vat, gross_with_vat, withholding, net).
+    """
+    base_amount = rate * quantity
+    gross_amount = base_amount + expenses
+    
+    # No VAT on the invoice under reverse charge
+    vat_amount = 0 if reverse_charge else gross_amount * vat_rate / 100
+    gross_with_vat = gross_amount + vat_amount
+    
+    withholding_amount = gross_amount * withholding_rate / 100 if withholding_rate > 0 else 0
+    
+    # Net
+    if reverse_charge:
+        net_amount = gross_amount - withholding_amount
+    else:
+        net_amount = gross_with_vat - withholding_amount
+    
+    return base_amount, gross_amount, vat_amount, gross_with_vat, withholding_amount, net_amount
@@ -11,4 +11,11 @@ class FreelancerPaymentItem(Document):
     
     def before_save(self):
         """Calculate amount from quantity and rate"""
-        self.amount = flt(self.quantity) * flt(self.rate)
+        self.amount = get_item_amount(self.quantity, self.rate)
+
+
+def get_item_amount(quantity, rate) -> float:
+    """Multiply quantity by rate, only coercing through flt for non-numeric values"""
+    if type(quantity) in (int, float) and type(rate) in (int, float):
+        return quantity * rate
+    return flt(quantity) * flt(rate)
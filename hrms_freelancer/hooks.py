@@ -1,6 +1,9 @@
 """
 Frappe Hooks Configuration
 Defines app behavior, doctypes, fixtures, and integrations
+
+Hooks must stay plain module-level values: Frappe collects them with
+dir()/getattr() on this module once and caches the merged result in Redis.
 """
 
 app_name = "hrms_freelancer"
@@ -135,6 +138,8 @@ fixtures = [
 
 # Document Events
 # ---------------
+# Freelancer, Freelancer Contract and Freelancer Payment are handled by their
+# own controllers and need no doc_events entries.
 
 doc_events = {
     "Employee": {
@@ -146,60 +151,28 @@ doc_events = {
         "validate": "hrms_freelancer.overrides.salary_slip.validate_freelancer_payment",
         "before_submit": "hrms_freelancer.overrides.salary_slip.before_submit_freelancer"
     },
+    "User": {
+        "on_update": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.clear_payment_approvers_cache",
+        "on_trash": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.clear_payment_approvers_cache"
+    },
+    "Account": {
+        "on_update": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.clear_vat_account_cache",
+        "on_trash": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.clear_vat_account_cache",
+        "after_rename": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.clear_vat_account_cache"
+    },
     "Sales Invoice": {
         "on_submit": "hrms_freelancer.integrations.erpnext.on_freelancer_invoice_submit",
         "on_cancel": "hrms_freelancer.integrations.erpnext.on_freelancer_invoice_cancel"
-    },
-    "Freelancer": {
-        "validate": "hrms_freelancer.freelancer.doctype.freelancer.freelancer.validate_freelancer",
-        "on_update": "hrms_freelancer.freelancer.doctype.freelancer.freelancer.on_update",
-        "after_insert": "hrms_freelancer.freelancer.doctype.freelancer.freelancer.after_insert"
-    },
-    "Freelancer Contract": {
-        "validate": "hrms_freelancer.freelancer.doctype.freelancer_contract.freelancer_contract.validate_contract",
-        "on_submit": "hrms_freelancer.freelancer.doctype.freelancer_contract.freelancer_contract.on_submit",
-        "before_cancel": "hrms_freelancer.freelancer.doctype.freelancer_contract.freelancer_contract.before_cancel"
-    },
-    "Freelancer Payment": {
-        "validate": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.validate_payment",
-        "on_submit": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.on_submit",
-        "on_cancel": "hrms_freelancer.freelancer.doctype.freelancer_payment.freelancer_payment.on_cancel"
     }
 }
 
 # Scheduled Tasks
 # ---------------
 
+# All scheduled tasks are enqueued from one hourly tick, see tasks/scheduler.py
 scheduler_events = {
-    "cron": {
-        # Update exchange rates daily at 6 AM
-        "0 6 * * *": [
-            "hrms_freelancer.tasks.daily.update_exchange_rates"
-        ],
-        # Check contract expiry weekly on Monday at 9 AM
-        "0 9 * * 1": [
-            "hrms_freelancer.tasks.weekly.check_contract_expiry_notifications"
-        ],
-        # Monthly compliance check on 1st at 8 AM
-        "0 8 1 * *": [
-            "hrms_freelancer.tasks.monthly.run_compliance_checks"
-        ],
-        # Quarterly VAT summary generation
-        "0 10 1 1,4,7,10 *": [
-            "hrms_freelancer.tasks.quarterly.generate_vat_summaries"
-        ]
-    },
-    "daily": [
-        "hrms_freelancer.tasks.daily.process_pending_milestone_reminders",
-        "hrms_freelancer.tasks.daily.check_payment_due_dates"
-    ],
-    "weekly": [
-        "hrms_freelancer.tasks.weekly.generate_compliance_reports",
-        "hrms_freelancer.tasks.weekly.sync_tax_treaty_updates"
-    ],
-    "monthly": [
-        "hrms_freelancer.tasks.monthly.archive_completed_contracts",
-        "hrms_freelancer.tasks.monthly.send_tax_summary_reports"
+    "hourly": [
+        "hrms_freelancer.tasks.scheduler.tick"
     ]
 }
 
@@ -221,6 +194,13 @@ override_doctype_dashboards = {
     "Employee": "hrms_freelancer.overrides.employee_dashboard.get_dashboard_data"
 }
 
+# Link field search
+# -----------------
+
+standard_queries = {
+    "Freelancer": "hrms_freelancer.freelancer.doctype.freelancer.freelancer.search_freelancers"
+}
+
 # Permission Query Conditions
 # ---------------------------
 
@@ -3,24 +3,53 @@ Freelancer DocType Controller
 Handles freelancer/contractor profile management with EU and international compliance
 """
 
+import re
 from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from datetime import date, datetime
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import getdate, nowdate, add_days, flt, cint
+from frappe.utils import getdate, nowdate, now_datetime, add_days, flt, cint
+
+from hrms_freelancer.utils.constants import EU_COUNTRY_NAME_SET
 
 if TYPE_CHECKING:
     from frappe.types import DF
 
-# List of EU member states (as of 2026)
-EU_COUNTRIES = [
-    "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czech Republic",
-    "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary",
-    "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg", "Malta", "Netherlands",
-    "Poland", "Portugal", "Romania", "Slovakia", "Slovenia", "Spain", "Sweden"
-]
+# Country code prefix of EU VAT numbers
+EU_VAT_PREFIXES = {
+    "Austria": "AT", "Belgium": "BE", "Bulgaria": "BG",
+    "Croatia": "HR", "Cyprus": "CY", "Czech Republic": "CZ",
+    "Denmark": "DK", "Estonia": "EE", "Finland": "FI",
+    "France": "FR", "Germany": "DE", "Greece": "EL",
+    "Hungary": "HU", "Ireland": "IE", "Italy": "IT",
+    "Latvia": "LV", "Lithuania": "LT", "Luxembourg": "LU",
+    "Malta": "MT", "Netherlands": "NL", "Poland": "PL",
+    "Portugal": "PT", "Romania": "RO", "Slovakia": "SK",
+    "Slovenia": "SI", "Spain": "ES", "Sweden": "SE"
+}
+
+# Minimum VAT number length (including prefix) checked by validate_vat_number_vies
+VAT_NUMBER_MIN_LENGTHS = {"NL": 12, "DE": 11, "FR": 13, "BE": 12}
+
+# EU Minimum Wages 2026 (estimated, EUR/month)
+EU_MIN_WAGES = {
+    "Netherlands": 2100,
+    "Germany": 2050,
+    "France": 1900,
+    "Belgium": 2000,
+    "Luxembourg": 2700,
+    "Ireland": 2200,
+    "Spain": 1450,
+    "Italy": 1300,  # No statutory minimum, sectoral
+    "Portugal": 1000,
+    "Greece": 950,
+    "Poland": 850,
+    "Czech Republic": 750,
+    "Romania": 650,
+    "Bulgaria": 500,
+}
 
 # Default withholding tax rates by country (2026 estimates)
 DEFAULT_WITHHOLDING_RATES = {
@@ -37,6 +66,9 @@ DEFAULT_WITHHOLDING_RATES = {
     "Switzerland": 0,  # Under treaty with most EU countries
 }
 
+# Words long enough for the fulltext index (innodb_ft_min_token_size = 3)
+_SEARCH_WORD = re.compile(r"\w{3,}")
+
 
 class Freelancer(Document):
     """
@@ -86,54 +118,82 @@ class Freelancer(Document):
         self.set_full_name()
         self.validate_email_unique()
         self.set_eu_country_status()
-        self.validate_vat_number()
-        self.calculate_withholding_rate()
+        
+        # Skip checks whose inputs are unchanged since the last save
+        if self.has_any_value_changed("vat_number", "vat_registered", "tax_residency_country"):
+            self.validate_vat_number()
+        
+        if self.has_any_value_changed(
+            "tax_residency_country", "tax_treaty_applicable", "vat_registered"
+        ):
+            self.calculate_withholding_rate()
+        
         self.validate_eu_compliance()
         self.validate_rates()
         self.validate_gdpr_consent()
-        self.check_minimum_wage_compliance()
+        
+        if self.has_any_value_changed("rate", "billing_type", "company"):
+            self.check_minimum_wage_compliance()
+        
+        self.set_compliance_notes()
+    
+    def has_any_value_changed(self, *fieldnames: str) -> bool:
+        """True for new documents or if any of the fields changed"""
+        return any(self.has_value_changed(fieldname) for fieldname in fieldnames)
     
     def before_save(self) -> None:
         """Actions before saving the document"""
         if self.gdpr_consent_given and not self.gdpr_consent_date:
-            self.gdpr_consent_date = frappe.utils.now_datetime()
+            self.gdpr_consent_date = now_datetime()
     
     def on_update(self) -> None:
         """Actions after document update"""
         self.create_gdpr_consent_log()
         self.sync_with_linked_employee()
-        self.update_compliance_status()
     
     def after_insert(self) -> None:
         """Actions after document creation"""
         self.create_user_if_needed()
-        self.send_welcome_email()
-        self.log_onboarding()
+        
+        # Email and onboarding log don't need to hold up the insert
+        frappe.enqueue(
+            "hrms_freelancer.freelancer.doctype.freelancer.freelancer.process_onboarding",
+            queue="short",
+            enqueue_after_commit=True,
+            freelancer=self.name
+        )
     
     def set_full_name(self) -> None:
         """Construct full name from name components"""
-        name_parts = [self.first_name]
         if self.middle_name:
-            name_parts.append(self.middle_name)
-        name_parts.append(self.last_name)
-        self.full_name = " ".join(name_parts)
+            self.full_name = f"{self.first_name} {self.middle_name} {self.last_name}"
+        else:
+            self.full_name = f"{self.first_name} {self.last_name}"
     
     def validate_email_unique(self) -> None:
         """Ensure email is unique across freelancers"""
-        if self.email:
-            existing = frappe.db.exists(
-                "Freelancer",
-                {"email": self.email, "name": ("!=", self.name)}
+        # email is a unique column; this check only gives a friendlier
+        # message, so it is skipped when the email hasn't changed
+        if not self.email or not self.has_value_changed("email"):
+            return
+        
+        existing = frappe.db.exists(
+            "Freelancer",
+            {"email": self.email, "name": ("!=", self.name)}
+        )
+        if existing:
+            frappe.throw(
+                _("A freelancer with email {0} already exists").format(self.email)
             )
-            if existing:
-                frappe.throw(
-                    _("A freelancer with email {0} already exists").format(self.email)
-                )
     
     def set_eu_country_status(self) -> None:
         """Determine if tax residency country is in EU"""
         if self.tax_residency_country:
-            self.is_eu_country = self.tax_residency_country in EU_COUNTRIES
+            is_eu = frappe.get_cached_value("Country", self.tax_residency_country, "is_eu")
+            if is_eu is None:
+                # Country.is_eu not installed yet
+                is_eu = self.tax_residency_country in EU_COUNTRY_NAME_SET
+            self.is_eu_country = cint(is_eu)
         else:
             self.is_eu_country = 0
     
@@ -145,19 +205,7 @@ class Freelancer(Document):
                 vat = self.vat_number.upper().replace(" ", "")
                 
                 # VAT number should start with country code
-                country_codes = {
-                    "Austria": "AT", "Belgium": "BE", "Bulgaria": "BG",
-                    "Croatia": "HR", "Cyprus": "CY", "Czech Republic": "CZ",
-                    "Denmark": "DK", "Estonia": "EE", "Finland": "FI",
-                    "France": "FR", "Germany": "DE", "Greece": "EL",
-                    "Hungary": "HU", "Ireland": "IE", "Italy": "IT",
-                    "Latvia": "LV", "Lithuania": "LT", "Luxembourg": "LU",
-                    "Malta": "MT", "Netherlands": "NL", "Poland": "PL",
-                    "Portugal": "PT", "Romania": "RO", "Slovakia": "SK",
-                    "Slovenia": "SI", "Spain": "ES", "Sweden": "SE"
-                }
-                
-                expected_prefix = country_codes.get(self.tax_residency_country)
+                expected_prefix = EU_VAT_PREFIXES.get(self.tax_residency_country)
                 if expected_prefix and not vat.startswith(expected_prefix):
                     frappe.msgprint(
                         _("VAT number should start with country code {0} for {1}").format(
@@ -177,7 +225,18 @@ class Freelancer(Document):
         
         # Check for applicable tax treaty
         if self.tax_treaty_applicable:
-            treaty = frappe.get_doc("Tax Treaty", self.tax_treaty_applicable)
+            # Document cache; invalidated by Frappe when the treaty is saved
+            treaty = frappe.get_cached_value(
+                "Tax Treaty",
+                self.tax_treaty_applicable,
+                ["reduced_rate", "standard_rate"],
+                as_dict=True
+            )
+            if not treaty:
+                frappe.throw(
+                    _("Tax Treaty {0} not found").format(self.tax_treaty_applicable),
+                    frappe.DoesNotExistError
+                )
             self.withholding_tax_rate = treaty.reduced_rate or treaty.standard_rate
             return
         
@@ -236,31 +295,12 @@ class Freelancer(Document):
             return
         
         # Get minimum wage for the working country
-        company_doc = frappe.get_doc("Company", self.company)
-        work_country = company_doc.country if company_doc else None
+        work_country = frappe.db.get_value("Company", self.company, "country")
         
         if not work_country:
             return
         
-        # EU Minimum Wages 2026 (estimated, EUR/month)
-        eu_minimum_wages = {
-            "Netherlands": 2100,
-            "Germany": 2050,
-            "France": 1900,
-            "Belgium": 2000,
-            "Luxembourg": 2700,
-            "Ireland": 2200,
-            "Spain": 1450,
-            "Italy": 1300,  # No statutory minimum, sectoral
-            "Portugal": 1000,
-            "Greece": 950,
-            "Poland": 850,
-            "Czech Republic": 750,
-            "Romania": 650,
-            "Bulgaria": 500,
-        }
-        
-        min_wage = eu_minimum_wages.get(work_country)
+        min_wage = EU_MIN_WAGES.get(work_country)
         if not min_wage:
             return
         
@@ -285,44 +325,44 @@ class Freelancer(Document):
             return 0
         
         # Assuming standard working hours
-        conversions = {
-            "Hourly": self.rate * 160,  # 40 hours/week * 4 weeks
-            "Daily": self.rate * 22,     # ~22 working days/month
-            "Weekly": self.rate * 4.33,  # Weeks per month
-            "Monthly": self.rate,
-            "Project-Based": self.rate,  # Cannot convert, use as-is
-            "Milestone-Based": self.rate
-        }
+        if self.billing_type == "Hourly":
+            return self.rate * 160  # 40 hours/week * 4 weeks
+        if self.billing_type == "Daily":
+            return self.rate * 22  # ~22 working days/month
+        if self.billing_type == "Weekly":
+            return self.rate * 4.33  # Weeks per month
         
-        return conversions.get(self.billing_type, self.rate)
+        # Monthly, or Project/Milestone-Based which cannot be converted
+        return self.rate
     
     def create_gdpr_consent_log(self) -> None:
         """Log GDPR consent changes"""
         if self.has_value_changed("gdpr_consent_given"):
+            # All fields are set here, so write the row directly instead of
+            # running the log's validate/hooks/permission checks via insert()
             frappe.get_doc({
                 "doctype": "GDPR Consent Log",
                 "freelancer": self.name,
                 "user": frappe.session.user,
                 "action": "Consent Given" if self.gdpr_consent_given else "Consent Withdrawn",
-                "timestamp": frappe.utils.now_datetime(),
+                "timestamp": now_datetime(),
                 "ip_address": frappe.local.request_ip if hasattr(frappe.local, 'request_ip') else None,
                 "purposes": self.data_processing_purposes
-            }).insert(ignore_permissions=True)
+            }).db_insert()
     
     def sync_with_linked_employee(self) -> None:
         """Sync data with linked employee for hybrid workers"""
         if self.linked_employee:
-            # Update employee with freelancer status
-            frappe.db.set_value(
-                "Employee",
-                self.linked_employee,
-                "custom_is_hybrid_worker",
-                1,
-                update_modified=False
-            )
-    
-    def update_compliance_status(self) -> None:
-        """Update overall compliance status"""
+            # Update employee with freelancer status, only if not flagged yet
+            frappe.db.sql("""
+                UPDATE `tabEmployee`
+                SET custom_is_hybrid_worker = 1
+                WHERE name = %s
+                    AND IFNULL(custom_is_hybrid_worker, 0) = 0
+            """, self.linked_employee)
+    
+    def set_compliance_notes(self) -> None:
+        """Set overall compliance status, saved with the document"""
         compliance_issues = []
         
         if self.is_eu_country and not self.gdpr_consent_given:
@@ -334,23 +374,19 @@ class Freelancer(Document):
         if self.vat_registered and not self.vat_number:
             compliance_issues.append("VAT number missing")
         
-        if compliance_issues:
-            frappe.db.set_value(
-                "Freelancer",
-                self.name,
-                "compliance_notes",
-                ", ".join(compliance_issues),
-                update_modified=False
-            )
+        self.compliance_notes = ", ".join(compliance_issues)
     
     def create_user_if_needed(self) -> None:
         """Create portal user for freelancer self-service"""
         if self.user_id:
             return
         
-        # Check if user creation is enabled in settings
-        settings = frappe.get_single("HR Settings")
-        if not getattr(settings, "auto_create_freelancer_user", False):
+        # Check if user creation is enabled in settings (the flag is a custom
+        # field, and get_single_value throws for fields that don't exist)
+        if not frappe.get_meta("HR Settings").has_field("auto_create_freelancer_user"):
+            return
+        
+        if not frappe.db.get_single_value("HR Settings", "auto_create_freelancer_user"):
             return
         
         if not frappe.db.exists("User", self.email):
@@ -364,8 +400,7 @@ class Freelancer(Document):
                 "roles": [{"role": "Freelancer"}]
             })
             user.insert(ignore_permissions=True)
-            self.user_id = user.name
-            frappe.db.set_value("Freelancer", self.name, "user_id", user.name)
+            self.db_set("user_id", user.name, update_modified=False)
     
     def send_welcome_email(self) -> None:
         """Send welcome email to new freelancer"""
@@ -414,6 +449,95 @@ def after_insert(doc: Freelancer, method: str = None) -> None:
     pass  # Main logic in document class
 
 
+def on_doctype_update() -> None:
+    """Add a fulltext index on the name fields for link search (MariaDB only)"""
+    if frappe.db.db_type != "mariadb":
+        return
+    
+    if not frappe.db.sql("""
+        SHOW INDEX FROM `tabFreelancer` WHERE Key_name = 'freelancer_name_search'
+    """):
+        frappe.db.sql_ddl("""
+            ALTER TABLE `tabFreelancer`
+            ADD FULLTEXT INDEX freelancer_name_search (full_name, contractor_name)
+        """)
+
+
+@frappe.whitelist()
+@frappe.validate_and_sanitize_search_inputs
+def search_freelancers(
+    doctype: str,
+    txt: str,
+    searchfield: str,
+    start: int,
+    page_len: int,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[tuple]:
+    """
+    Link field search for Freelancer
+    
+    On MariaDB, names are matched by whole words through the fulltext name
+    index instead of a LIKE '%txt%' scan; ID and email still match with
+    LIKE. Short input and other databases fall back to LIKE on all search
+    fields. Results go through get_list, so permissions still apply.
+    """
+    if isinstance(filters, dict):
+        filters = [
+            [field, *value] if isinstance(value, (list, tuple)) else [field, "=", value]
+            for field, value in filters.items()
+        ]
+    filters = list(filters or [])
+    or_filters = None
+    
+    words = _SEARCH_WORD.findall(txt or "")
+    if words and frappe.db.db_type == "mariadb":
+        names = frappe.db.sql_list("""
+            SELECT name FROM `tabFreelancer`
+            WHERE MATCH(full_name, contractor_name) AGAINST (%s IN BOOLEAN MODE)
+        """, " ".join(f"+{word}*" for word in words))
+        or_filters = [
+            ["name", "like", f"%{txt}%"],
+            ["email", "like", f"%{txt}%"]
+        ]
+        if names:
+            or_filters.append(["name", "in", names])
+    elif txt:
+        or_filters = [
+            [field, "like", f"%{txt}%"]
+            for field in ("name", "full_name", "contractor_name", "email")
+        ]
+    
+    return frappe.get_list(
+        "Freelancer",
+        filters=filters,
+        or_filters=or_filters,
+        fields=["name", "full_name"],
+        order_by="full_name asc",
+        limit_start=cint(start),
+        limit_page_length=cint(page_len),
+        as_list=True
+    )
+
+
+def process_onboarding(freelancer: str) -> None:
+    """Background job: send the welcome email and log onboarding"""
+    doc = frappe.get_doc("Freelancer", freelancer)
+    doc.send_welcome_email()
+    doc.log_onboarding()
+
+
+def get_freelancer_values(freelancer: str, fields: List[str]) -> Dict[str, Any]:
+    """
+    Read a few Freelancer fields without loading the full document
+    
+    Raises DoesNotExistError like frappe.get_doc when the freelancer is missing.
+    """
+    values = frappe.db.get_value("Freelancer", freelancer, fields, as_dict=True)
+    if not values:
+        frappe.throw(_("Freelancer {0} not found").format(freelancer), frappe.DoesNotExistError)
+    return values
+
+
 @frappe.whitelist()
 def create_contract(freelancer: str) -> str:
     """
@@ -425,7 +549,9 @@ def create_contract(freelancer: str) -> str:
     Returns:
         Name of created contract
     """
-    freelancer_doc = frappe.get_doc("Freelancer", freelancer)
+    freelancer_doc = get_freelancer_values(
+        freelancer, ["full_name", "company", "currency", "billing_type", "rate"]
+    )
     
     contract = frappe.get_doc({
         "doctype": "Freelancer Contract",
@@ -454,7 +580,11 @@ def create_payment(freelancer: str, contract: str = None) -> str:
     Returns:
         Name of created payment
     """
-    freelancer_doc = frappe.get_doc("Freelancer", freelancer)
+    freelancer_doc = get_freelancer_values(
+        freelancer,
+        ["full_name", "company", "currency", "billing_type", "rate",
+         "withholding_tax_rate", "vat_rate", "vat_registered", "reverse_charge_applicable"]
+    )
     
     payment = frappe.get_doc({
         "doctype": "Freelancer Payment",
@@ -520,7 +650,7 @@ def export_gdpr_data(freelancer: str, format: str = "json") -> Dict[str, Any]:
         "payments": [],
         "consent_log": [],
         "export_metadata": {
-            "exported_at": frappe.utils.now_datetime(),
+            "exported_at": now_datetime(),
             "exported_by": frappe.session.user,
             "format": format
         }
@@ -556,7 +686,7 @@ def export_gdpr_data(freelancer: str, format: str = "json") -> Dict[str, Any]:
         "freelancer": freelancer,
         "user": frappe.session.user,
         "action": "Data Export",
-        "timestamp": frappe.utils.now_datetime(),
+        "timestamp": now_datetime(),
         "purposes": f"GDPR data portability export in {format} format"
     }).insert(ignore_permissions=True)
     
@@ -574,41 +704,38 @@ def get_freelancer_summary(freelancer: str) -> Dict[str, Any]:
     Returns:
         Dictionary with summary statistics
     """
-    # Total contracts
-    total_contracts = frappe.db.count(
-        "Freelancer Contract",
-        {"freelancer": freelancer}
-    )
-    
-    active_contracts = frappe.db.count(
-        "Freelancer Contract",
-        {"freelancer": freelancer, "status": "Active"}
-    )
-    
-    # Total payments
-    total_paid = frappe.db.sql("""
-        SELECT COALESCE(SUM(net_amount), 0) as total
+    # Contract counts by status
+    contracts_by_status = dict(frappe.db.sql("""
+        SELECT status, COUNT(*)
+        FROM `tabFreelancer Contract`
+        WHERE freelancer = %s
+        GROUP BY status
+    """, freelancer))
+    
+    # Total paid and pending payments
+    total_paid, pending_payments = frappe.db.sql("""
+        SELECT
+            COALESCE(SUM(CASE WHEN docstatus = 1 THEN net_amount END), 0),
+            COUNT(CASE WHEN status = 'Pending' THEN 1 END)
         FROM `tabFreelancer Payment`
-        WHERE freelancer = %s AND docstatus = 1
-    """, freelancer, as_dict=True)[0].total
-    
-    pending_payments = frappe.db.count(
-        "Freelancer Payment",
-        {"freelancer": freelancer, "status": "Pending"}
-    )
+        WHERE freelancer = %s
+    """, freelancer)[0]
     
     # Compliance status
-    freelancer_doc = frappe.get_doc("Freelancer", freelancer)
+    freelancer_info = get_freelancer_values(
+        freelancer,
+        ["residency_status", "is_eu_country", "gdpr_consent_given", "vat_registered"]
+    )
     
     return {
-        "total_contracts": total_contracts,
-        "active_contracts": active_contracts,
+        "total_contracts": sum(contracts_by_status.values()),
+        "active_contracts": contracts_by_status.get("Active", 0),
         "total_paid": total_paid,
         "pending_payments": pending_payments,
-        "residency_status": freelancer_doc.residency_status,
-        "is_eu": freelancer_doc.is_eu_country,
-        "gdpr_consent": freelancer_doc.gdpr_consent_given,
-        "vat_registered": freelancer_doc.vat_registered
+        "residency_status": freelancer_info.residency_status,
+        "is_eu": freelancer_info.is_eu_country,
+        "gdpr_consent": freelancer_info.gdpr_consent_given,
+        "vat_registered": freelancer_info.vat_registered
     }
 
 
@@ -640,8 +767,7 @@ def validate_vat_number_vies(vat_number: str, country_code: str) -> Dict[str, An
             }
         
         # Mock: Consider valid if proper length
-        min_lengths = {"NL": 12, "DE": 11, "FR": 13, "BE": 12}
-        min_len = min_lengths.get(country_code, 8)
+        min_len = VAT_NUMBER_MIN_LENGTHS.get(country_code, 8)
         
         if len(vat_clean) < min_len:
             return {
@@ -9,15 +9,19 @@ import frappe
 from frappe import _
 
 
+# Static config; Frappe merges it into its own cached notification config
+_NOTIFICATION_CONFIG = {
+    "for_doctype": {
+        "Freelancer": {"status": "Active"},
+        "Freelancer Contract": {"status": ("in", ("Draft", "Pending Approval"))},
+        "Freelancer Payment": {"docstatus": 0},
+    },
+    "for_module_doctypes": {
+        "HRMS Freelancer": ["Freelancer", "Freelancer Contract", "Freelancer Payment"]
+    }
+}
+
+
 def get_notification_config():
     """Returns notification config for HRMS Freelancer doctypes"""
-    return {
-        "for_doctype": {
-            "Freelancer": {"status": "Active"},
-            "Freelancer Contract": {"status": ("in", ("Draft", "Pending Approval"))},
-            "Freelancer Payment": {"docstatus": 0},
-        },
-        "for_module_doctypes": {
-            "HRMS Freelancer": ["Freelancer", "Freelancer Contract", "Freelancer Payment"]
-        }
-    }
+    return _NOTIFICATION_CONFIG
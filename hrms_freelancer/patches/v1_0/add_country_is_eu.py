@@ -0,0 +1,9 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+from hrms_freelancer.setup.install import create_country_eu_field
+
+
+def execute():
+    """Add Country.is_eu on existing sites"""
+    create_country_eu_field()
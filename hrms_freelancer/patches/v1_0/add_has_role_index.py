@@ -0,0 +1,9 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+from hrms_freelancer.setup.install import add_has_role_index
+
+
+def execute():
+    """Add the Has Role (role, parent) index on existing sites"""
+    add_has_role_index()
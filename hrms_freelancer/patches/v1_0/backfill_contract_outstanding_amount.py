@@ -0,0 +1,16 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+import frappe
+
+
+def execute():
+    """Recompute contract outstanding amount as invoiced minus paid
+
+    Payments now adjust outstanding_amount incrementally, so existing rows
+    need a correct starting balance.
+    """
+    frappe.db.sql("""
+        UPDATE `tabFreelancer Contract`
+        SET outstanding_amount = COALESCE(total_invoiced, 0) - COALESCE(total_paid, 0)
+    """)
@@ -24,6 +24,8 @@ def after_install():
     """Run after the app is installed"""
     print("Setting up HRMS Freelancer module...")
     
+    add_has_role_index()
+    create_country_eu_field()
     create_custom_roles()
     create_default_vat_configurations()
     create_default_tax_treaties()
@@ -33,6 +35,36 @@ def after_install():
     print("HRMS Freelancer setup complete!")
 
 
+def add_has_role_index():
+    """Index Has Role by (role, parent) for the payment approver lookup"""
+    frappe.db.add_index("Has Role", ["role", "parent"])
+
+
+def create_country_eu_field():
+    """Add an EU membership flag to Country and set it for EU member states"""
+    from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+    from hrms_freelancer.utils.constants import EU_COUNTRY_NAMES
+    
+    create_custom_fields({
+        "Country": [
+            {
+                "fieldname": "is_eu",
+                "label": "EU Member State",
+                "fieldtype": "Check",
+                "insert_after": "code",
+                "module": "HRMS Freelancer"
+            }
+        ]
+    })
+    
+    frappe.db.set_value("Country", {"name": ("in", EU_COUNTRY_NAMES)}, "is_eu", 1)
+
+
+def get_existing_names(doctype, names):
+    """Return which of the given names already exist, in one query"""
+    return set(frappe.get_all(doctype, filters={"name": ("in", names)}, pluck="name"))
+
+
 def create_custom_roles():
     """Create custom roles for freelancer management"""
     roles = [
@@ -53,8 +85,10 @@ def create_custom_roles():
         }
     ]
     
+    existing = get_existing_names("Role", [role["role_name"] for role in roles])
+    
     for role in roles:
-        if not frappe.db.exists("Role", role["role_name"]):
+        if role["role_name"] not in existing:
             doc = frappe.get_doc({
                 "doctype": "Role",
                 "role_name": role["role_name"],
@@ -89,8 +123,10 @@ def create_default_vat_configurations():
         {"name": "Switzerland", "country": "Switzerland", "standard_rate": 8.1, "reduced_rate": 2.6},
     ]
     
+    existing = get_existing_names("VAT Configuration", [config["name"] for config in vat_configs])
+    
     for config in vat_configs:
-        if not frappe.db.exists("VAT Configuration", config["name"]):
+        if config["name"] not in existing:
             doc = frappe.get_doc({
                 "doctype": "VAT Configuration",
                 "name": config["name"],
@@ -145,8 +181,10 @@ def create_default_tax_treaties():
         },
     ]
     
+    existing = get_existing_names("Tax Treaty", [treaty["treaty_code"] for treaty in treaties])
+    
     for treaty in treaties:
-        if not frappe.db.exists("Tax Treaty", treaty["treaty_code"]):
+        if treaty["treaty_code"] not in existing:
             doc = frappe.get_doc({
                 "doctype": "Tax Treaty",
                 **treaty
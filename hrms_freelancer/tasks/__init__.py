@@ -1,7 +1,20 @@
 # Copyright (c) 2024, HRMS Freelancer and contributors
 # For license information, please see license.txt
 
-from hrms_freelancer.tasks.daily import *
-from hrms_freelancer.tasks.weekly import *
-from hrms_freelancer.tasks.monthly import *
-from hrms_freelancer.tasks.quarterly import *
+import importlib
+
+# Task modules whose functions are re-exported from this package
+_TASK_MODULES = ("daily", "weekly", "monthly", "quarterly")
+
+
+def __getattr__(name):
+    """Resolve task functions from the task modules on first access"""
+    if name not in _TASK_MODULES and not name.startswith("_"):
+        for module_name in _TASK_MODULES:
+            module = importlib.import_module(f"{__name__}.{module_name}")
+            if hasattr(module, name):
+                value = getattr(module, name)
+                globals()[name] = value
+                return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
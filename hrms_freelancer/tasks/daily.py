@@ -7,7 +7,8 @@ Daily scheduled tasks for HRMS Freelancer
 
 import frappe
 from frappe import _
-from frappe.utils import nowdate, add_days, getdate
+from frappe.desk.doctype.notification_log.notification_log import set_notifications_as_unseen
+from frappe.utils import nowdate, now_datetime, add_days, getdate
 
 
 def update_exchange_rates():
@@ -49,33 +50,46 @@ def process_pending_milestone_reminders():
             fields=["name", "parent", "milestone_name", "due_date", "amount"]
         )
         
+        if not upcoming_milestones:
+            return
+        
+        # Fetch the contracts and freelancers of all milestones up front
+        freelancer_by_contract = dict(frappe.get_all(
+            "Freelancer Contract",
+            filters={"name": ["in", list({m.parent for m in upcoming_milestones})]},
+            fields=["name", "freelancer"],
+            as_list=True
+        ))
+        freelancers = {
+            f.name: f for f in frappe.get_all(
+                "Freelancer",
+                filters={"name": ["in", list({name for name in freelancer_by_contract.values() if name})]},
+                fields=["name", "email", "first_name"]
+            )
+        }
+        
         for milestone in upcoming_milestones:
-            # Get contract details
-            contract = frappe.get_doc("Freelancer Contract", milestone.parent)
-            
             # Send notification to freelancer
-            if contract.freelancer:
-                freelancer = frappe.get_doc("Freelancer", contract.freelancer)
-                if freelancer.email:
-                    frappe.sendmail(
-                        recipients=[freelancer.email],
-                        subject=_("Milestone Due Reminder: {0}").format(milestone.milestone_name),
-                        message=_("""
+            freelancer = freelancers.get(freelancer_by_contract.get(milestone.parent))
+            if freelancer and freelancer.email:
+                frappe.sendmail(
+                    recipients=[freelancer.email],
+                    subject=_("Milestone Due Reminder: {0}").format(milestone.milestone_name),
+                    message=_("""
                             <p>Dear {0},</p>
                             <p>This is a reminder that the milestone <strong>{1}</strong> is due on <strong>{2}</strong>.</p>
                             <p>Contract: {3}</p>
                             <p>Amount: {4}</p>
                             <p>Please ensure timely completion.</p>
                         """).format(
-                            freelancer.first_name,
-                            milestone.milestone_name,
-                            milestone.due_date,
-                            contract.name,
-                            frappe.format_value(milestone.amount, {"fieldtype": "Currency"})
-                        ),
-                        now=True
+                        freelancer.first_name,
+                        milestone.milestone_name,
+                        milestone.due_date,
+                        milestone.parent,
+                        frappe.format_value(milestone.amount, {"fieldtype": "Currency"})
                     )
-                    
+                )
+    
     except Exception as e:
         frappe.log_error(
             title="Milestone Reminder Failed",
@@ -95,31 +109,53 @@ def check_contract_expirations():
             fields=["name", "freelancer", "company", "end_date", "contract_value"]
         )
         
-        for contract in expiring_contracts:
-            # Get company users to notify
-            company_users = frappe.get_all(
-                "User",
-                filters={
-                    "enabled": 1
-                },
-                fields=["name", "email"],
-                limit=5  # Limit to avoid spamming
+        if not expiring_contracts:
+            return
+        
+        # Get users to notify, the same for every contract
+        users = frappe.get_all(
+            "User",
+            filters={
+                "enabled": 1
+            },
+            pluck="name",
+            limit=5  # Limit to avoid spamming
+        )
+        
+        # Create the notifications for all contracts and users in one INSERT
+        now = now_datetime()
+        values = [
+            (
+                frappe.generate_hash(length=10),
+                _("Contract Expiring: {0}").format(contract.name),
+                user,
+                "Alert",
+                "Freelancer Contract",
+                contract.name,
+                _("Contract {0} expires on {1}").format(contract.name, contract.end_date),
+                0,
+                now,
+                now,
+                "Administrator",
+                "Administrator"
             )
-            
-            # Create a notification
-            for user in company_users:
-                frappe.get_doc({
-                    "doctype": "Notification Log",
-                    "subject": _("Contract Expiring: {0}").format(contract.name),
-                    "for_user": user.name,
-                    "type": "Alert",
-                    "document_type": "Freelancer Contract",
-                    "document_name": contract.name,
-                    "email_content": _("Contract {0} expires on {1}").format(
-                        contract.name, contract.end_date
-                    )
-                }).insert(ignore_permissions=True)
-                
+            for contract in expiring_contracts
+            for user in users
+        ]
+        frappe.db.bulk_insert(
+            "Notification Log",
+            fields=[
+                "name", "subject", "for_user", "type", "document_type", "document_name",
+                "email_content", "read", "creation", "modified", "owner", "modified_by"
+            ],
+            values=values
+        )
+        
+        # bulk_insert skips Notification Log.after_insert, so update the bell here
+        for user in users:
+            set_notifications_as_unseen(user)
+            frappe.publish_realtime("notification", after_commit=True, user=user)
+    
     except Exception as e:
         frappe.log_error(
             title="Contract Expiration Check Failed",
@@ -29,74 +29,23 @@ def generate_vat_summaries():
         
         quarter_label = f"Q{prev_quarter} {year}"
         
-        # Get all submitted payments in the quarter
-        payments = frappe.get_all(
-            "Freelancer Payment",
-            filters={
-                "posting_date": ["between", [quarter_start, quarter_end]],
-                "docstatus": 1
-            },
-            fields=[
-                "name", "freelancer", "company", "gross_amount", "net_amount",
-                "vat_amount", "vat_rate", "withholding_tax", "currency",
-                "vat_treatment", "posting_date"
-            ]
-        )
+        summary = get_quarter_vat_summary(quarter_start, quarter_end)
         
-        if not payments:
+        if not summary["payment_count"]:
             frappe.log_error(
                 title=f"VAT Summary {quarter_label}",
                 message="No payments found for the quarter"
             )
             return
         
-        # Group by VAT treatment
-        vat_summary = {
-            "standard": {"count": 0, "gross": 0, "vat": 0},
-            "reverse_charge": {"count": 0, "gross": 0, "vat": 0},
-            "exempt": {"count": 0, "gross": 0, "vat": 0},
-            "export": {"count": 0, "gross": 0, "vat": 0}
-        }
-        
-        # Group by country for EC Sales List
-        ec_sales = {}
-        
-        for payment in payments:
-            treatment = payment.vat_treatment or "standard"
-            if treatment not in vat_summary:
-                treatment = "standard"
-            
-            vat_summary[treatment]["count"] += 1
-            vat_summary[treatment]["gross"] += flt(payment.gross_amount)
-            vat_summary[treatment]["vat"] += flt(payment.vat_amount)
-            
-            # Get freelancer country for EC Sales
-            if payment.freelancer:
-                freelancer = frappe.get_value(
-                    "Freelancer", 
-                    payment.freelancer, 
-                    ["country", "vat_number"],
-                    as_dict=True
-                )
-                
-                if freelancer and freelancer.country:
-                    country = freelancer.country
-                    if country not in ec_sales:
-                        ec_sales[country] = {
-                            "count": 0, 
-                            "value": 0,
-                            "vat_numbers": set()
-                        }
-                    ec_sales[country]["count"] += 1
-                    ec_sales[country]["value"] += flt(payment.gross_amount)
-                    if freelancer.vat_number:
-                        ec_sales[country]["vat_numbers"].add(freelancer.vat_number)
+        vat_summary = summary["vat_summary"]
+        ec_sales = summary["ec_sales"]
         
         # Generate report
         report = f"""
         <h2>Quarterly VAT Summary - {quarter_label}</h2>
         <p>Period: {quarter_start} to {quarter_end}</p>
-        <p>Total Payments: {len(payments)}</p>
+        <p>Total Payments: {summary["payment_count"]}</p>
         
         <h3>VAT Treatment Summary</h3>
         <table border="1" cellpadding="5">
@@ -174,6 +123,86 @@ def generate_vat_summaries():
         )
 
 
+def get_vat_treatment(
+    reverse_charge: int,
+    vat_applicable: int,
+    vat_rate: float,
+    is_eu_freelancer: int
+) -> str:
+    """Classify a payment for the VAT summary from its VAT fields"""
+    if reverse_charge:
+        return "reverse_charge"
+    if vat_applicable and flt(vat_rate) > 0:
+        return "standard"
+    # No VAT charged: outside the EU VAT area, or exempt within it
+    return "exempt" if is_eu_freelancer else "export"
+
+
+def get_quarter_vat_summary(quarter_start, quarter_end) -> dict:
+    """
+    Aggregate submitted payments posted between the given dates
+    
+    Returns the payment count, totals per VAT treatment and the EC Sales
+    List totals per freelancer country.
+    """
+    # Get all submitted payments in the quarter, as plain tuples of the
+    # columns the summary needs, with the freelancer's country and VAT
+    # number joined in instead of looked up per payment
+    payments = frappe.db.sql("""
+        SELECT
+            p.reverse_charge, p.vat_applicable, p.vat_rate, p.is_eu_freelancer,
+            p.gross_amount, p.vat_amount,
+            f.country, f.vat_number
+        FROM `tabFreelancer Payment` p
+        LEFT JOIN `tabFreelancer` f ON f.name = p.freelancer
+        WHERE p.docstatus = 1
+        AND p.posting_date BETWEEN %s AND %s
+    """, (quarter_start, quarter_end))
+    
+    # Group by VAT treatment
+    vat_summary = {
+        "standard": {"count": 0, "gross": 0, "vat": 0},
+        "reverse_charge": {"count": 0, "gross": 0, "vat": 0},
+        "exempt": {"count": 0, "gross": 0, "vat": 0},
+        "export": {"count": 0, "gross": 0, "vat": 0}
+    }
+    
+    # Group by country for EC Sales List
+    ec_sales = {}
+    
+    for (
+        reverse_charge, vat_applicable, vat_rate, is_eu_freelancer,
+        gross_amount, vat_amount, country, vat_number
+    ) in payments:
+        summary = vat_summary[
+            get_vat_treatment(reverse_charge, vat_applicable, vat_rate, is_eu_freelancer)
+        ]
+        gross_amount = flt(gross_amount)
+        
+        summary["count"] += 1
+        summary["gross"] += gross_amount
+        summary["vat"] += flt(vat_amount)
+        
+        # Freelancer country for EC Sales
+        if country:
+            if country not in ec_sales:
+                ec_sales[country] = {
+                    "count": 0, 
+                    "value": 0,
+                    "vat_numbers": set()
+                }
+            ec_sales[country]["count"] += 1
+            ec_sales[country]["value"] += gross_amount
+            if vat_number:
+                ec_sales[country]["vat_numbers"].add(vat_number)
+    
+    return {
+        "payment_count": len(payments),
+        "vat_summary": vat_summary,
+        "ec_sales": ec_sales
+    }
+
+
 def review_tax_treaty_effectiveness():
     """Review tax treaty usage and effectiveness"""
     try:
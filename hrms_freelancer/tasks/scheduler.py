@@ -0,0 +1,92 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Hourly scheduler dispatcher for HRMS Freelancer
+
+A single hourly job enqueues the tasks that are due, instead of registering
+a separate scheduler entry for every task. The last run of each task is
+stored as a global default, so a late, skipped or paused tick still runs
+the tasks that fell due in the meantime, once.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from croniter import croniter
+
+import frappe
+from frappe.utils import get_datetime, now_datetime
+
+
+# (cron expression, method) pairs, checked once per hourly tick
+SCHEDULE = (
+    # Update exchange rates daily at 6 AM
+    ("0 6 * * *", "hrms_freelancer.tasks.daily.update_exchange_rates"),
+    # Daily at midnight
+    ("0 0 * * *", "hrms_freelancer.tasks.daily.process_pending_milestone_reminders"),
+    ("0 0 * * *", "hrms_freelancer.tasks.daily.check_payment_due_dates"),
+    # Check contract expiry weekly on Monday at 9 AM
+    ("0 9 * * 1", "hrms_freelancer.tasks.weekly.check_contract_expiry_notifications"),
+    # Weekly on Sunday at midnight
+    ("0 0 * * 0", "hrms_freelancer.tasks.weekly.generate_compliance_reports"),
+    ("0 0 * * 0", "hrms_freelancer.tasks.weekly.sync_tax_treaty_updates"),
+    # Monthly compliance check on 1st at 8 AM
+    ("0 8 1 * *", "hrms_freelancer.tasks.monthly.run_compliance_checks"),
+    # Monthly on the 1st at midnight
+    ("0 0 1 * *", "hrms_freelancer.tasks.monthly.archive_completed_contracts"),
+    ("0 0 1 * *", "hrms_freelancer.tasks.monthly.send_tax_summary_reports"),
+    # Quarterly VAT summary generation on the 1st at 10 AM
+    ("0 10 1 1,4,7,10 *", "hrms_freelancer.tasks.quarterly.generate_vat_summaries"),
+)
+
+# Heavy tasks run on the long queue so they don't hold up short jobs
+LONG_QUEUE_TASKS = frozenset({
+    "hrms_freelancer.tasks.monthly.run_compliance_checks",
+    "hrms_freelancer.tasks.monthly.send_tax_summary_reports",
+    "hrms_freelancer.tasks.quarterly.generate_vat_summaries",
+})
+
+# Global default holding the last run time of a task
+LAST_RUN_KEY = "hrms_freelancer_last_run:{0}"
+
+
+def is_due(cron: str, last_run: datetime, now: datetime) -> bool:
+    """True if the cron schedule fired after last_run, up to and including now"""
+    return croniter(cron, last_run).get_next(datetime) <= now
+
+
+def get_last_run(method: str) -> Optional[datetime]:
+    """Get the stored last run time of a task"""
+    last_run = frappe.db.get_global(LAST_RUN_KEY.format(method))
+    return get_datetime(last_run) if last_run else None
+
+
+def set_last_run(method: str, when: datetime) -> None:
+    """Store the last run time of a task"""
+    frappe.db.set_global(LAST_RUN_KEY.format(method), str(when))
+
+
+def tick():
+    """Enqueue every scheduled task that fell due since its last run"""
+    now = now_datetime()
+
+    for cron, method in SCHEDULE:
+        last_run = get_last_run(method)
+
+        # First tick after install: start counting from now
+        if not last_run:
+            set_last_run(method, now)
+            continue
+
+        if not is_due(cron, last_run, now):
+            continue
+
+        # One job per task, so a failure shows up against that job
+        frappe.enqueue(
+            method,
+            queue="long" if method in LONG_QUEUE_TASKS else "default",
+            job_id=method,
+            deduplicate=True
+        )
+        set_last_run(method, now)
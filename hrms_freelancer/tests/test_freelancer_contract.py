@@ -0,0 +1,61 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for Freelancer Contract monthly valuation
+"""
+
+import unittest
+from datetime import date
+
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_months, getdate
+
+from hrms_freelancer.freelancer.doctype.freelancer_contract.freelancer_contract import (
+    get_billable_months
+)
+
+
+class TestBillableMonths(FrappeTestCase):
+    """Test cases for get_billable_months"""
+    
+    def test_calendar_year(self):
+        """Test 1 Jan - 31 Dec is 12 months"""
+        self.assertEqual(get_billable_months(date(2027, 1, 1), date(2027, 12, 31)), 12)
+    
+    def test_same_day_next_year(self):
+        """Test 1 Jan - 1 Jan of the next year is 12 months, not 13"""
+        self.assertEqual(get_billable_months(date(2027, 1, 1), date(2028, 1, 1)), 12)
+    
+    def test_same_day_next_month(self):
+        """Test 15 Jan - 15 Feb is one month, not two"""
+        self.assertEqual(get_billable_months(date(2027, 1, 15), date(2027, 2, 15)), 1)
+    
+    def test_end_of_month_start(self):
+        """Test a start on the 31st ending on the last day of February"""
+        self.assertEqual(get_billable_months(date(2027, 1, 31), date(2027, 2, 28)), 1)
+        self.assertEqual(get_billable_months(date(2028, 1, 31), date(2028, 2, 29)), 1)
+    
+    def test_short_contract_counts_one_month(self):
+        """Test a contract shorter than a month is billed one month"""
+        self.assertEqual(get_billable_months(date(2027, 1, 1), date(2027, 1, 20)), 1)
+    
+    def test_renewed_contract(self):
+        """Test contracts built like renew_contract are valued at the extension"""
+        for old_end, extension_months in (
+            ("2026-12-31", 12),
+            ("2027-01-30", 1),  # starts 31 Jan, ends 28 Feb
+            ("2026-11-29", 3),  # starts 30 Nov, ends 28 Feb
+        ):
+            new_start = add_days(old_end, 1)
+            new_end = add_months(new_start, extension_months)
+            
+            self.assertEqual(
+                get_billable_months(getdate(new_start), getdate(new_end)),
+                extension_months,
+                f"renewal after {old_end} for {extension_months} months"
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for bulk payment approval
+"""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from hrms_freelancer.freelancer.doctype.freelancer_payment import freelancer_payment
+
+
+def make_payment(name, status="Pending Approval", docstatus=1):
+    """Build a payment row as returned by frappe.get_all"""
+    return frappe._dict(
+        name=name, docstatus=docstatus, status=status, freelancer="_Test Freelancer",
+        currency="EUR", net_amount=100, due_date="2027-01-31"
+    )
+
+
+class TestBulkApprovePayments(FrappeTestCase):
+    """Test cases for bulk_approve_payments"""
+    
+    def approve(self, rows):
+        """Run bulk_approve_payments over rows, return (set_value, send_email) mocks"""
+        freelancers = [frappe._dict(name="_Test Freelancer", email="f@example.com", full_name="F")]
+        
+        with patch.object(frappe, "get_all", side_effect=[rows, freelancers]), \
+                patch.object(frappe, "has_permission", return_value=True), \
+                patch.object(frappe.db, "set_value") as set_value, \
+                patch.object(freelancer_payment, "send_payment_approved_email") as send_email:
+            try:
+                freelancer_payment.bulk_approve_payments([row.name for row in rows])
+            finally:
+                self.set_value, self.send_email = set_value, send_email
+    
+    def test_one_payment_not_pending_rejects_all(self):
+        """Test nothing is updated or emailed when one payment can't be approved"""
+        rows = [make_payment("PAY-1"), make_payment("PAY-2", status="Approved"), make_payment("PAY-3")]
+        
+        with self.assertRaises(frappe.ValidationError):
+            self.approve(rows)
+        
+        self.set_value.assert_not_called()
+        self.send_email.assert_not_called()
+    
+    def test_draft_payment_rejects_all(self):
+        """Test a draft payment in the batch stops the whole approval"""
+        rows = [make_payment("PAY-1"), make_payment("PAY-2", docstatus=0)]
+        
+        with self.assertRaises(frappe.ValidationError):
+            self.approve(rows)
+        
+        self.set_value.assert_not_called()
+        self.send_email.assert_not_called()
+    
+    def test_all_pending_approved_in_one_update(self):
+        """Test pending payments are approved with one UPDATE and one email each"""
+        rows = [make_payment("PAY-1"), make_payment("PAY-2", status="Invoice Received")]
+        
+        self.approve(rows)
+        
+        self.set_value.assert_called_once()
+        self.assertEqual(self.set_value.call_args.args[1], {"name": ["in", ["PAY-1", "PAY-2"]]})
+        self.assertEqual(self.send_email.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for the Freelancer link field search
+"""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+
+class TestSearchFreelancers(FrappeTestCase):
+    """Test cases for search_freelancers"""
+    
+    def search(self, txt, db_type="mariadb", fulltext_names=()):
+        """Run search_freelancers and return the get_list keyword arguments"""
+        from hrms_freelancer.freelancer.doctype.freelancer.freelancer import search_freelancers
+        
+        with patch.object(frappe.db, "db_type", db_type), \
+                patch.object(frappe.db, "sql_list", return_value=list(fulltext_names)) as sql_list, \
+                patch.object(frappe, "get_list", return_value=[]) as get_list:
+            search_freelancers("Freelancer", txt, "name", 0, 20, {"status": "Active"})
+        
+        return get_list.call_args.kwargs, sql_list
+    
+    def test_fulltext_keeps_id_and_email_matches(self):
+        """Test word searches still match the ID and email with LIKE"""
+        kwargs, sql_list = self.search("jansen", fulltext_names=["FRL-0001"])
+        
+        self.assertEqual(sql_list.call_args.args[1], "+jansen*")
+        self.assertEqual(kwargs["or_filters"], [
+            ["name", "like", "%jansen%"],
+            ["email", "like", "%jansen%"],
+            ["name", "in", ["FRL-0001"]]
+        ])
+        self.assertIn(["status", "=", "Active"], kwargs["filters"])
+    
+    def test_fulltext_without_matches_searches_id_and_email(self):
+        """Test an ID or email search with no name match still returns results"""
+        kwargs, _ = self.search("FRL-2026-00042")
+        
+        self.assertEqual(kwargs["or_filters"], [
+            ["name", "like", "%FRL-2026-00042%"],
+            ["email", "like", "%FRL-2026-00042%"]
+        ])
+    
+    def test_fulltext_query_is_not_capped(self):
+        """Test the fulltext query returns every match for paging by get_list"""
+        _, sql_list = self.search("jansen")
+        
+        self.assertNotIn("LIMIT", sql_list.call_args.args[0].upper())
+    
+    def test_short_input_uses_like(self):
+        """Test input without a three letter word falls back to LIKE on all fields"""
+        kwargs, sql_list = self.search("jo")
+        
+        sql_list.assert_not_called()
+        self.assertEqual(
+            [f[0] for f in kwargs["or_filters"]],
+            ["name", "full_name", "contractor_name", "email"]
+        )
+    
+    def test_other_databases_use_like(self):
+        """Test non-MariaDB databases fall back to LIKE"""
+        kwargs, sql_list = self.search("jansen", db_type="postgres")
+        
+        sql_list.assert_not_called()
+        self.assertEqual(len(kwargs["or_filters"]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
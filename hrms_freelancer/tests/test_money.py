@@ -0,0 +1,85 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for integer-cent money helpers
+These tests can run without Frappe installed.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the utils directory to the path so we can import the money module directly
+# This bypasses the __init__.py which has Frappe dependencies
+utils_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils')
+sys.path.insert(0, utils_path)
+
+import money
+
+to_cents = money.to_cents
+vat_cents = money.vat_cents
+
+
+class TestToCents(unittest.TestCase):
+    """Test cases for to_cents"""
+    
+    def test_two_decimal_amounts_are_exact(self):
+        """Test amounts with two decimals convert without float drift"""
+        self.assertEqual(to_cents(19.99), 1999)
+        self.assertEqual(to_cents(0.29), 29)  # 0.29 * 100 == 28.999...
+        self.assertEqual(to_cents(1000), 100000)
+    
+    def test_negative_amounts(self):
+        """Test negative amounts keep their sign"""
+        self.assertEqual(to_cents(-12.34), -1234)
+        self.assertEqual(to_cents(-0.29), -29)
+    
+    def test_rates_become_basis_points(self):
+        """Test percentages convert to basis points"""
+        self.assertEqual(to_cents(19), 1900)
+        self.assertEqual(to_cents(25.5), 2550)
+        self.assertEqual(to_cents(0), 0)
+
+
+class TestVATCents(unittest.TestCase):
+    """Test cases for vat_cents"""
+    
+    def test_whole_cent_vat(self):
+        """Test VAT that needs no rounding"""
+        self.assertEqual(vat_cents(100000, 1900), 19000)  # 1000.00 at 19%
+        self.assertEqual(vat_cents(0, 2100), 0)
+    
+    def test_half_cent_rounds_up(self):
+        """Test half a cent of VAT rounds up, not to even"""
+        self.assertEqual(vat_cents(5, 1000), 1)  # 0.05 at 10% = 0.5 cent
+        self.assertEqual(vat_cents(250, 2100), 53)  # 2.50 at 21% = 52.5 cents
+        self.assertEqual(vat_cents(650, 1000), 65)  # 6.50 at 10% = 65 cents exactly
+    
+    def test_below_half_cent_rounds_down(self):
+        """Test less than half a cent of VAT rounds down"""
+        self.assertEqual(vat_cents(4, 1000), 0)  # 0.04 at 10% = 0.4 cent
+        self.assertEqual(vat_cents(1234, 1900), 234)  # 12.34 at 19% = 234.46 cents
+    
+    def test_negative_amounts_round_away_from_zero(self):
+        """Test credit amounts mirror the positive result"""
+        self.assertEqual(vat_cents(-5, 1000), -1)
+        self.assertEqual(vat_cents(-250, 2100), -53)
+        self.assertEqual(vat_cents(-4, 1000), 0)
+        self.assertEqual(vat_cents(-100000, 1900), -19000)
+    
+    def test_total_is_amount_plus_vat(self):
+        """Test totals add up in cents without float rounding"""
+        amount = to_cents(2.50)
+        vat = vat_cents(amount, to_cents(21))
+        self.assertEqual((amount + vat) / 100, 3.03)
+        
+        # 2.50 at 7% is 2.675; round(2.675, 2) gives 2.67 on floats
+        amount = to_cents(2.50)
+        vat = vat_cents(amount, to_cents(7))
+        self.assertEqual(vat, 18)
+        self.assertEqual((amount + vat) / 100, 2.68)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for the quarterly VAT summary
+"""
+
+import unittest
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from hrms_freelancer.tasks.quarterly import get_quarter_vat_summary, get_vat_treatment
+
+
+QUARTER_START = "2001-01-01"
+QUARTER_END = "2001-03-31"
+
+
+def insert_freelancer(name, country, vat_number=None):
+    """Insert a bare Freelancer row"""
+    frappe.get_doc({
+        "doctype": "Freelancer",
+        "name": name,
+        "first_name": name,
+        "full_name": name,
+        "country": country,
+        "vat_number": vat_number
+    }).db_insert()
+
+
+def insert_payment(name, freelancer, posting_date="2001-02-15", docstatus=1, **values):
+    """Insert a bare Freelancer Payment row"""
+    frappe.get_doc({
+        "doctype": "Freelancer Payment",
+        "name": name,
+        "freelancer": freelancer,
+        "posting_date": posting_date,
+        "docstatus": docstatus,
+        **values
+    }).db_insert()
+
+
+class TestVATTreatment(FrappeTestCase):
+    """Test cases for get_vat_treatment"""
+    
+    def test_treatments(self):
+        """Test each treatment is derived from the payment's VAT fields"""
+        self.assertEqual(get_vat_treatment(1, 0, 0, 1), "reverse_charge")
+        self.assertEqual(get_vat_treatment(0, 1, 21, 1), "standard")
+        self.assertEqual(get_vat_treatment(0, 1, 0, 1), "exempt")
+        self.assertEqual(get_vat_treatment(0, 0, 0, 1), "exempt")
+        self.assertEqual(get_vat_treatment(0, 0, 0, 0), "export")
+
+
+class TestQuarterVATSummary(FrappeTestCase):
+    """Test cases for get_quarter_vat_summary over real rows"""
+    
+    def setUp(self):
+        """Insert freelancers and payments in and around the quarter"""
+        insert_freelancer("_Test VAT DE", "Germany", "DE123456789")
+        insert_freelancer("_Test VAT NL", "Netherlands")
+        insert_freelancer("_Test VAT US", "United States")
+        
+        insert_payment(
+            "_Test VAT Pay 1", "_Test VAT DE",
+            reverse_charge=1, is_eu_freelancer=1, gross_amount=1000, vat_amount=0
+        )
+        insert_payment(
+            "_Test VAT Pay 2", "_Test VAT NL",
+            vat_applicable=1, vat_rate=21, is_eu_freelancer=1, gross_amount=200, vat_amount=42
+        )
+        insert_payment(
+            "_Test VAT Pay 3", "_Test VAT US",
+            is_eu_freelancer=0, gross_amount=500, vat_amount=0
+        )
+        # Not counted: a draft, and a payment posted after the quarter
+        insert_payment("_Test VAT Pay 4", "_Test VAT NL", docstatus=0, gross_amount=50)
+        insert_payment("_Test VAT Pay 5", "_Test VAT NL", posting_date="2001-04-01", gross_amount=70)
+    
+    def test_summary(self):
+        """Test payments are grouped by treatment and freelancer country"""
+        summary = get_quarter_vat_summary(QUARTER_START, QUARTER_END)
+        vat_summary = summary["vat_summary"]
+        ec_sales = summary["ec_sales"]
+        
+        self.assertEqual(summary["payment_count"], 3)
+        self.assertEqual(vat_summary["reverse_charge"], {"count": 1, "gross": 1000, "vat": 0})
+        self.assertEqual(vat_summary["standard"], {"count": 1, "gross": 200, "vat": 42})
+        self.assertEqual(vat_summary["export"], {"count": 1, "gross": 500, "vat": 0})
+        self.assertEqual(vat_summary["exempt"]["count"], 0)
+        
+        self.assertEqual(set(ec_sales), {"Germany", "Netherlands", "United States"})
+        self.assertEqual(ec_sales["Germany"]["vat_numbers"], {"DE123456789"})
+        self.assertEqual(ec_sales["Netherlands"]["value"], 200)
+    
+    def test_empty_quarter(self):
+        """Test a quarter without submitted payments"""
+        summary = get_quarter_vat_summary("2000-01-01", "2000-03-31")
+        
+        self.assertEqual(summary["payment_count"], 0)
+        self.assertEqual(summary["ec_sales"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for the hourly scheduler dispatcher
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from hrms_freelancer.tasks import scheduler
+
+
+DAILY_6AM = "hrms_freelancer.tasks.daily.update_exchange_rates"
+QUARTERLY = "hrms_freelancer.tasks.quarterly.generate_vat_summaries"
+
+
+class TestIsDue(FrappeTestCase):
+    """Test cases for is_due"""
+    
+    def test_not_due_before_next_run(self):
+        """Test a daily 6 AM task is not due again before 6 AM"""
+        self.assertFalse(scheduler.is_due(
+            "0 6 * * *", datetime(2026, 3, 9, 6, 0, 5), datetime(2026, 3, 10, 5, 0)
+        ))
+    
+    def test_due_at_a_late_tick(self):
+        """Test a daily 6 AM task is due when the tick runs after 6 AM"""
+        self.assertTrue(scheduler.is_due(
+            "0 6 * * *", datetime(2026, 3, 9, 6, 0, 5), datetime(2026, 3, 10, 7, 45)
+        ))
+    
+    def test_missed_quarter_is_caught_up(self):
+        """Test a quarterly task is due after the scheduler was paused over its slot"""
+        self.assertTrue(scheduler.is_due(
+            "0 10 1 1,4,7,10 *", datetime(2026, 1, 1, 10, 0), datetime(2026, 4, 3, 9, 0)
+        ))
+        self.assertFalse(scheduler.is_due(
+            "0 10 1 1,4,7,10 *", datetime(2026, 1, 1, 10, 0), datetime(2026, 3, 31, 23, 0)
+        ))
+
+
+class TestTick(FrappeTestCase):
+    """Test cases for tick"""
+    
+    def run_tick(self, now, last_runs):
+        """Run tick at now with the given last run times, return (enqueued, stored)"""
+        stored = {}
+        with patch.object(scheduler, "now_datetime", return_value=now), \
+                patch.object(scheduler, "get_last_run", side_effect=last_runs.get), \
+                patch.object(scheduler, "set_last_run", side_effect=stored.__setitem__), \
+                patch.object(frappe, "enqueue") as enqueue:
+            scheduler.tick()
+        
+        enqueued = {call.args[0]: call.kwargs["queue"] for call in enqueue.call_args_list}
+        return enqueued, stored
+    
+    def test_first_tick_only_records_last_run(self):
+        """Test nothing runs before a task has a last run time"""
+        now = datetime(2026, 4, 1, 10, 5)
+        enqueued, stored = self.run_tick(now, {})
+        
+        self.assertEqual(enqueued, {})
+        self.assertEqual(set(stored), {method for _, method in scheduler.SCHEDULE})
+        self.assertTrue(all(when == now for when in stored.values()))
+    
+    def test_enqueues_only_due_tasks(self):
+        """Test due tasks are enqueued on their queue and others are left alone"""
+        now = datetime(2026, 4, 1, 10, 5)
+        last_runs = {method: now for _, method in scheduler.SCHEDULE}
+        last_runs[DAILY_6AM] = datetime(2026, 3, 31, 6, 0)
+        last_runs[QUARTERLY] = datetime(2026, 1, 1, 10, 0)
+        
+        enqueued, stored = self.run_tick(now, last_runs)
+        
+        self.assertEqual(enqueued, {DAILY_6AM: "default", QUARTERLY: "long"})
+        self.assertEqual(stored, {DAILY_6AM: now, QUARTERLY: now})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for the in-process Tax Treaty index
+"""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from hrms_freelancer.compliance.doctype.tax_treaty import tax_treaty
+
+
+def make_treaty(name, country_1, country_2, expiry_date=None):
+    """Build an active treaty row as returned by frappe.get_all"""
+    return frappe._dict(
+        name=name, treaty_name=name, country_1=country_1, country_2=country_2,
+        expiry_date=expiry_date
+    )
+
+
+class TestTreatyIndex(FrappeTestCase):
+    """Test cases for get_applicable_treaty and the treaty index"""
+    
+    def setUp(self):
+        """Start every test without a built index"""
+        tax_treaty._treaty_index_by_site.clear()
+    
+    def lookup(self, rows, version, *pairs):
+        """Look up country pairs with get_all and the index version patched"""
+        with patch.object(frappe, "get_all", return_value=rows) as get_all, \
+                patch.object(frappe.cache(), "get_value", return_value=version):
+            results = [tax_treaty.get_applicable_treaty(*pair) for pair in pairs]
+        return results, get_all
+    
+    def test_both_country_orders_resolve(self):
+        """Test a treaty is found whichever country is passed first"""
+        rows = [make_treaty("IN-NL", "India", "Netherlands")]
+        
+        (forward, backward), _ = self.lookup(
+            rows, "v1", ("India", "Netherlands"), ("Netherlands", "India")
+        )
+        
+        self.assertEqual(forward.name, "IN-NL")
+        self.assertEqual(backward.name, "IN-NL")
+    
+    def test_index_is_built_once_per_version(self):
+        """Test repeated lookups reuse the index until the version changes"""
+        rows = [make_treaty("IN-NL", "India", "Netherlands")]
+        
+        _, get_all = self.lookup(
+            rows, "v1", ("India", "Netherlands"), ("India", "Germany"), ("Netherlands", "India")
+        )
+        self.assertEqual(get_all.call_count, 1)
+        
+        _, get_all = self.lookup(rows, "v1", ("India", "Netherlands"))
+        get_all.assert_not_called()
+        
+        _, get_all = self.lookup(rows, "v2", ("India", "Netherlands"))
+        self.assertEqual(get_all.call_count, 1)
+    
+    def test_expired_treaty_is_skipped(self):
+        """Test the newest unexpired treaty wins"""
+        rows = [
+            make_treaty("NEW", "India", "Netherlands", expiry_date="2000-01-01"),
+            make_treaty("OLD", "India", "Netherlands"),
+        ]
+        
+        (treaty,), _ = self.lookup(rows, "v1", ("India", "Netherlands"))
+        
+        self.assertEqual(treaty.name, "OLD")
+    
+    def test_missing_pair_returns_none(self):
+        """Test countries without a treaty give None"""
+        (treaty,), _ = self.lookup([], "v1", ("India", "Brazil"))
+        
+        self.assertIsNone(treaty)
+    
+    def test_version_bump_waits_for_commit(self):
+        """Test clear_treaty_cache defers the version bump until after commit"""
+        with patch.object(frappe.db.after_commit, "add") as add, \
+                patch.object(frappe.cache(), "set_value") as set_value:
+            tax_treaty.clear_treaty_cache()
+        
+        set_value.assert_not_called()
+        add.assert_called_once_with(tax_treaty._bump_treaty_index_version)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Unit tests for VAT calculation
+"""
+
+import unittest
+from unittest.mock import patch
+
+from frappe.tests.utils import FrappeTestCase
+
+
+VAT_CONFIGURATION = "hrms_freelancer.compliance.doctype.vat_configuration.vat_configuration"
+
+
+class TestCalculateVAT(FrappeTestCase):
+    """Test cases for calculate_vat totals"""
+    
+    def calculate(self, amount, rate, **kwargs):
+        """Run calculate_vat with get_vat_rate returning the given rate"""
+        from hrms_freelancer.compliance.doctype.vat_configuration.vat_configuration import calculate_vat
+        
+        vat_info = {"rate": rate, "reverse_charge": False, "is_eu": True, "notes": ""}
+        with patch(f"{VAT_CONFIGURATION}.get_vat_rate", return_value=vat_info):
+            return calculate_vat(amount, "Germany", **kwargs)
+    
+    def test_standard_rate_totals(self):
+        """Test VAT and total for a whole-cent result"""
+        result = self.calculate(1000, 19)
+        
+        self.assertEqual(result["vat_amount"], 190.0)
+        self.assertEqual(result["total_amount"], 1190.0)
+    
+    def test_half_cent_rounds_up(self):
+        """Test half a cent of VAT rounds up"""
+        result = self.calculate(2.50, 21)  # 52.5 cents of VAT
+        
+        self.assertEqual(result["vat_amount"], 0.53)
+        self.assertEqual(result["total_amount"], 3.03)
+    
+    def test_negative_amount_mirrors_positive(self):
+        """Test credit amounts round away from zero"""
+        result = self.calculate(-2.50, 21)
+        
+        self.assertEqual(result["vat_amount"], -0.53)
+        self.assertEqual(result["total_amount"], -3.03)
+    
+    def test_missing_rate_is_zero(self):
+        """Test a rate of None gives no VAT"""
+        result = self.calculate(100, None)
+        
+        self.assertEqual(result["vat_amount"], 0)
+        self.assertEqual(result["total_amount"], 100.0)
+    
+    def test_eu_cross_border_b2b_reverse_charge(self):
+        """Test cross-border EU B2B applies reverse charge"""
+        result = self.calculate(1000, 19, is_b2b=True, is_cross_border=True)
+        
+        self.assertTrue(result["reverse_charge"])
+        self.assertEqual(result["vat_amount"], 0)
+        self.assertEqual(result["total_amount"], 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
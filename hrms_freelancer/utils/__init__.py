@@ -3,77 +3,61 @@
 
 """
 HRMS Freelancer utilities package
-"""
-
-from hrms_freelancer.utils.currency import (
-    get_exchange_rate,
-    convert_currency,
-    format_currency_amount,
-    update_exchange_rates_from_api,
-    get_all_exchange_rates
-)
 
-from hrms_freelancer.utils.tax_calculations import (
-    TaxCalculator,
-    calculate_freelancer_taxes,
-    estimate_annual_tax_burden,
-    get_tax_year_dates,
-    validate_tax_id
-)
+Re-exports are resolved lazily, so importing a single submodule (e.g. the
+jinja helpers referenced from hooks.py) does not pull in the tax and
+currency modules.
+"""
 
-from hrms_freelancer.utils.constants import (
-    EU_COUNTRIES,
-    EU_COUNTRY_CODES,
-    EU_COUNTRY_NAMES,
-    EUROZONE_COUNTRIES,
-    NON_EUROZONE_EU_COUNTRIES,
-    TREATY_COUNTRIES,
-    WITHHOLDING_TAX_RATES,
-    VAT_REDUCED_RATES,
-    SERVICE_CATEGORIES,
-    GDPR_CONSENT_TYPES,
-    GDPR_DATA_RETENTION_PERIODS,
-    CURRENCY_SYMBOLS,
-    get_vat_rate,
-    get_country_name,
-    is_eu_country,
-    is_eurozone_country,
-    get_country_currency,
-    get_retention_period
-)
+import importlib
 
-__all__ = [
+# Public name -> submodule it is re-exported from
+_LAZY_IMPORTS = {
     # Currency utilities
-    "get_exchange_rate",
-    "convert_currency",
-    "format_currency_amount",
-    "update_exchange_rates_from_api",
-    "get_all_exchange_rates",
-    
+    "get_exchange_rate": "currency",
+    "convert_currency": "currency",
+    "format_currency_amount": "currency",
+    "update_exchange_rates_from_api": "currency",
+    "get_all_exchange_rates": "currency",
+
     # Tax utilities
-    "TaxCalculator",
-    "calculate_freelancer_taxes",
-    "estimate_annual_tax_burden",
-    "get_tax_year_dates",
-    "validate_tax_id",
-    
+    "TaxCalculator": "tax_calculations",
+    "calculate_freelancer_taxes": "tax_calculations",
+    "estimate_annual_tax_burden": "tax_calculations",
+    "get_tax_year_dates": "tax_calculations",
+    "validate_tax_id": "tax_calculations",
+
     # Constants
-    "EU_COUNTRIES",
-    "EU_COUNTRY_CODES",
-    "EU_COUNTRY_NAMES",
-    "EUROZONE_COUNTRIES",
-    "NON_EUROZONE_EU_COUNTRIES",
-    "TREATY_COUNTRIES",
-    "WITHHOLDING_TAX_RATES",
-    "VAT_REDUCED_RATES",
-    "SERVICE_CATEGORIES",
-    "GDPR_CONSENT_TYPES",
-    "GDPR_DATA_RETENTION_PERIODS",
-    "CURRENCY_SYMBOLS",
-    "get_vat_rate",
-    "get_country_name",
-    "is_eu_country",
-    "is_eurozone_country",
-    "get_country_currency",
-    "get_retention_period"
-]
+    "EU_COUNTRIES": "constants",
+    "EU_COUNTRY_CODES": "constants",
+    "EU_COUNTRY_NAMES": "constants",
+    "EU_COUNTRY_NAME_SET": "constants",
+    "EUROZONE_COUNTRIES": "constants",
+    "NON_EUROZONE_EU_COUNTRIES": "constants",
+    "TREATY_COUNTRIES": "constants",
+    "WITHHOLDING_TAX_RATES": "constants",
+    "VAT_REDUCED_RATES": "constants",
+    "SERVICE_CATEGORIES": "constants",
+    "GDPR_CONSENT_TYPES": "constants",
+    "GDPR_DATA_RETENTION_PERIODS": "constants",
+    "CURRENCY_SYMBOLS": "constants",
+    "get_vat_rate": "constants",
+    "get_country_name": "constants",
+    "is_eu_country": "constants",
+    "is_eurozone_country": "constants",
+    "get_country_currency": "constants",
+    "get_retention_period": "constants",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """Import re-exported names from their submodule on first access"""
+    submodule = _LAZY_IMPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
@@ -43,6 +43,9 @@ EU_COUNTRY_CODES = list(EU_COUNTRIES.keys())
 # List of EU country names
 EU_COUNTRY_NAMES = [info['name'] for info in EU_COUNTRIES.values()]
 
+# Set of EU country names, for membership checks against Country names
+EU_COUNTRY_NAME_SET = frozenset(EU_COUNTRY_NAMES)
+
 # Eurozone countries (countries using EUR as main currency)
 EUROZONE_COUNTRIES = [code for code, info in EU_COUNTRIES.items() if info['currency'] == 'EUR']
 
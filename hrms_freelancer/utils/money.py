@@ -0,0 +1,19 @@
+# Copyright (c) 2024, HRMS Freelancer and contributors
+# For license information, please see license.txt
+
+"""
+Integer-cent money helpers for HRMS Freelancer
+
+These have no Frappe dependency, so they can be tested standalone.
+"""
+
+
+def to_cents(value: float) -> int:
+    """Convert an amount (or a percentage, giving basis points) to an integer"""
+    return int(round(value * 100))
+
+
+def vat_cents(amount_cents: int, rate_bp: int) -> int:
+    """VAT in cents for an amount in cents and a rate in basis points, half-up"""
+    vat = (abs(amount_cents) * rate_bp + 5000) // 10000
+    return vat if amount_cents >= 0 else -vat